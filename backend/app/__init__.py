@@ -1,20 +1,44 @@
-from flask import Flask, jsonify
+import importlib
+import time
+
+# Import time of each third-party module, for the startup profile (each
+# includes the modules it is the first to import, e.g. werkzeug for flask)
+_IMPORT_TIMES = {}
+for _module in ('flask', 'flask_cors', 'flask_jwt_extended'):
+    _started = time.perf_counter()
+    importlib.import_module(_module)
+    _IMPORT_TIMES[_module] = (_started, time.perf_counter())
+
+from flask import Flask, jsonify, request
 from flask_cors import CORS
-from flask_jwt_extended import JWTManager
+from flask_jwt_extended import JWTManager, verify_jwt_in_request
 from app.config import config
+from app.utils.admission import AdmissionControl
 from app.utils.database import init_db
+from app.utils.metrics import collect_metrics, has_metrics_token, register_metrics
+from app.utils.startup import StartupProfile, Warmup
 
 
 def create_app(config_name='default'):
     """Flask application factory"""
+    profile = StartupProfile()
+    for module, (started, finished) in _IMPORT_TIMES.items():
+        profile.record(f'import:{module}', started, finished)
+    
     app = Flask(__name__)
     
     # Load configuration
     app.config.from_object(config[config_name])
     
     # Initialize extensions
-    CORS(app, origins=app.config['CORS_ORIGINS'])
-    jwt = JWTManager(app)
+    with profile.phase('extensions'):
+        CORS(app, origins=app.config['CORS_ORIGINS'])
+        if app.config['JWT_CACHE_ENABLED']:
+            CachingJWTManager = profile.import_module('app.auth.token_cache').CachingJWTManager
+            jwt = CachingJWTManager(app, max_size=app.config['JWT_CACHE_MAX_SIZE'])
+            register_metrics(app, 'jwt_cache', jwt.token_cache.stats)
+        else:
+            jwt = JWTManager(app)
     
     # JWT error handlers
     @jwt.expired_token_loader
@@ -29,19 +53,35 @@ def create_app(config_name='default'):
     def unauthorized_callback(error):
         return jsonify({"msg": "Missing Authorization Header"}), 401
 
-    # Register token blacklist checker
-    from app.auth.routes import is_token_revoked
+    # Scoped tokens (stream tokens from /api/items/stream/token) only open the event stream
+    @jwt.token_verification_loader
+    def check_token_scope(jwt_header, jwt_payload):
+        return jwt_payload.get('scope') is None or request.endpoint == 'api.stream_item_changes'
+
+    @jwt.token_verification_failed_loader
+    def token_scope_callback(jwt_header, jwt_payload):
+        return jsonify({"msg": "Token is not valid for this endpoint"}), 403
+
+    # Blueprint modules, each timed on first import
+    auth_routes = profile.import_module('app.auth.routes')
+    api_routes = profile.import_module('app.api.routes')
+    jobs_routes = profile.import_module('app.jobs.routes')
     
+    # Register token blacklist checker
     @jwt.token_in_blocklist_loader
     def check_if_token_revoked(jwt_header, jwt_payload):
-        return is_token_revoked(jwt_header, jwt_payload)
+        return auth_routes.is_token_revoked(jwt_header, jwt_payload)
     
     # Register blueprints
-    from app.auth.routes import auth_bp
-    from app.api.routes import api_bp
+    app.register_blueprint(auth_routes.auth_bp)
+    app.register_blueprint(api_routes.api_bp)
+    app.register_blueprint(jobs_routes.jobs_bp)
     
-    app.register_blueprint(auth_bp)
-    app.register_blueprint(api_bp)
+    # Readiness: warmup tasks registered below (and by other components)
+    # must finish before /ready returns 200
+    warmup = Warmup(app, profile)
+    app.extensions['startup_profile'] = profile
+    app.extensions['warmup'] = warmup
     
     # Health check endpoint
     @app.route("/")
@@ -49,9 +89,89 @@ def create_app(config_name='default'):
         """Health check endpoint"""
         return jsonify({"message": "Item Manager API is running!"})
     
+    @app.route("/ready")
+    def ready():
+        """Readiness endpoint: 200 once the database is initialised and caches are warm"""
+        status = warmup.status()
+        status['startup'] = profile.report()
+        return jsonify(status), 200 if status['ready'] else 503
+    
+    @app.route("/metrics")
+    def metrics():
+        """Runtime metrics (caches, limits) for monitoring: needs a user's access token or METRICS_TOKEN"""
+        if not has_metrics_token():
+            verify_jwt_in_request()
+        return jsonify(collect_metrics())
+    
+    # Shed load with fast 503s once a route class is saturated
+    if app.config['ADMISSION_CONTROL_ENABLED']:
+        AdmissionControl(app)
+    
+    # Background job engine
+    with profile.phase('jobs'):
+        from app.jobs.handlers import JOB_HANDLERS
+        from app.jobs.manager import JobManager
+        
+        job_manager = JobManager(
+            app,
+            JOB_HANDLERS,
+            max_workers=app.config['JOB_WORKERS'],
+            max_pending=app.config['JOB_MAX_PENDING']
+        )
+        app.extensions['job_manager'] = job_manager
+        register_metrics(app, 'jobs', job_manager.stats)
+    
     # Initialize database (only if not in testing mode)
     if not app.config.get('TESTING', False):
-        with app.app_context():
+        with profile.phase('init_db'), app.app_context():
             init_db()
+        warmup.register('recover_jobs', job_manager.recover)
+    
+    # Periodic database maintenance in quiet periods
+    if app.config['MAINTENANCE_ENABLED']:
+        from app.utils.maintenance import MaintenanceScheduler
+        
+        MaintenanceScheduler(app).start()
+    
+    # Concurrent identical item reads share one query and one serialization
+    from app.utils.singleflight import SingleFlight
+    
+    single_flight = SingleFlight(app.config['SINGLE_FLIGHT_TRACKED_KEYS'])
+    app.extensions['single_flight'] = single_flight
+    register_metrics(app, 'single_flight', single_flight.stats)
+    
+    # In-memory prefix index behind /api/items/suggest
+    from app.models.item import Item
+    from app.utils.prefix_index import PrefixIndex
+    
+    def load_names():
+        # Also called from the index's background rebuild thread
+        with app.app_context():
+            return Item.load_names()
+    
+    def load_changes(since):
+        # Past SUGGEST_CATCH_UP_LIMIT changes a full rebuild is cheaper
+        with app.app_context():
+            changes = Item.get_changes(since, app.config['SUGGEST_CATCH_UP_LIMIT'])
+        if changes['has_more']:
+            return None
+        return changes['seq'], [(row['id'], row['name']) for row in changes['items']], changes['deleted']
+    
+    suggest_index = PrefixIndex(
+        load_names, Item.current_seq, app.config['SUGGEST_CHECK_INTERVAL'], changes_loader=load_changes
+    )
+    app.extensions['suggest_index'] = suggest_index
+    register_metrics(app, 'suggest_index', suggest_index.stats)
+    
+    # The index lives in this process, so building it before /ready spares the
+    # first typeahead request a full load. (In testing the database is only
+    # initialised after create_app.)
+    if not app.config.get('TESTING', False):
+        warmup.register('suggest_index', suggest_index.build)
+    if app.config['WARMUP_PAGE_CACHE_ITEMS']:
+        warmup.register('page_cache', lambda: Item.prime_page_cache(app.config['WARMUP_PAGE_CACHE_ITEMS']))
+    
+    profile.record('create_app', profile.started)
+    warmup.start(background=app.config['WARMUP_IN_BACKGROUND'])
     
     return app
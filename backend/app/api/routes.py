@@ -1,18 +1,41 @@
-from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required
+import json
+import time
+from flask import Blueprint, Response, current_app, request, jsonify, stream_with_context
+from flask_jwt_extended import create_access_token, get_jwt, get_jwt_identity, get_jwt_request_location, jwt_required
 from app.models.item import Item
-from app.utils.validators import validate_item_data
+from app.utils.database import get_db_connection
+from app.utils.validators import parse_fields, validate_item_data
 
 api_bp = Blueprint('api', __name__, url_prefix='/api')
 
+# Claim marking tokens that may only open the item event stream
+STREAM_TOKEN_SCOPE = 'item_stream'
+
+
+def coalesced_json(key, load):
+    """Share one database read and one JSON serialization among concurrent identical requests
+
+    `load()` returns (payload, status); it runs once per burst of requests
+    with the same key and every request gets the same serialized body.
+    """
+    def produce():
+        payload, status = load()
+        return current_app.json.dumps(payload), status
+    
+    body, status = current_app.extensions['single_flight'].do(key, produce)
+    return current_app.response_class(f"{body}\n", status=status, mimetype='application/json')
+
 
 @api_bp.route("/items", methods=["GET"])
 @jwt_required()
 def get_items():
-    """Get all items (authentication required)"""
+    """Get all items, optionally only ?fields=a,b (authentication required)"""
+    fields, errors = parse_fields(request.args.get('fields'), Item.FIELDS)
+    if errors:
+        return jsonify({"errors": errors}), 400
+    
     try:
-        items = Item.get_all()
-        return jsonify(items)
+        return coalesced_json(('items', tuple(fields or ())), lambda: (Item.get_all(fields), 200))
     except Exception as e:
         return jsonify({"error": "Failed to fetch items"}), 500
 
@@ -46,17 +69,184 @@ def create_item():
         return jsonify({"error": "Failed to create item"}), 500
 
 
+@api_bp.route("/items/stats", methods=["GET"])
+@jwt_required()
+def get_item_stats():
+    """Get item counts, price totals and price histogram (authentication required)"""
+    try:
+        return jsonify(Item.get_stats())
+    except Exception as e:
+        return jsonify({"error": "Failed to fetch item statistics"}), 500
+
+
+@api_bp.route("/items/suggest", methods=["GET"])
+@jwt_required()
+def suggest_items():
+    """Typeahead suggestions for item names starting with ?prefix= (authentication required)"""
+    prefix = request.args.get('prefix', '')
+    limit = request.args.get('limit', current_app.config['SUGGEST_DEFAULT_LIMIT'], type=int)
+    if limit < 1:
+        return jsonify({"error": "limit must be >= 1"}), 400
+    limit = min(limit, current_app.config['SUGGEST_MAX_LIMIT'])
+
+    try:
+        return jsonify(Item.suggest(prefix, limit))
+    except Exception as e:
+        return jsonify({"error": "Failed to fetch suggestions"}), 500
+
+
+@api_bp.route("/items/changes", methods=["GET"])
+@jwt_required()
+def get_item_changes():
+    """Get items changed and deleted since a sequence number (authentication required)"""
+    since = request.args.get('since', 0, type=int)
+    limit = request.args.get('limit', current_app.config['ITEM_CHANGES_DEFAULT_LIMIT'], type=int)
+    if since < 0 or limit < 1:
+        return jsonify({"error": "since must be >= 0 and limit must be >= 1"}), 400
+    limit = min(limit, current_app.config['ITEM_CHANGES_MAX_LIMIT'])
+
+    try:
+        return jsonify(Item.get_changes(since, limit))
+    except Exception as e:
+        return jsonify({"error": "Failed to fetch item changes"}), 500
+
+
+@api_bp.route("/items/stream/token", methods=["POST"])
+@jwt_required()
+def create_stream_token():
+    """Issue a short-lived token that opens the event stream from the query string (authentication required)"""
+    expires = current_app.config['ITEM_STREAM_TOKEN_EXPIRES']
+    token = create_access_token(
+        identity=get_jwt_identity(),
+        expires_delta=expires,
+        additional_claims={"user_id": get_jwt().get('user_id'), "scope": STREAM_TOKEN_SCOPE}
+    )
+    return jsonify({"token": token, "expires_in": int(expires.total_seconds())})
+
+
+@api_bp.route("/items/stream", methods=["GET"])
+@jwt_required(locations=['headers', 'query_string'])
+def stream_item_changes():
+    """Push the latest change sequence number over server-sent events (authentication required)
+
+    Browsers' EventSource cannot set headers; it passes a stream token as ?token=.
+    """
+    # Full access tokens do not belong in URLs, which end up in access logs
+    if get_jwt_request_location() == 'query_string' and get_jwt().get('scope') != STREAM_TOKEN_SCOPE:
+        return jsonify({"error": "Use a token from POST /api/items/stream/token in the query string"}), 401
+
+    since = request.headers.get('Last-Event-ID', type=int)
+    if since is None:
+        since = request.args.get('since', -1, type=int)
+
+    poll_interval = current_app.config['ITEM_STREAM_POLL_INTERVAL']
+    heartbeat_interval = current_app.config['ITEM_STREAM_HEARTBEAT_INTERVAL']
+    max_duration = current_app.config['ITEM_STREAM_MAX_DURATION']
+
+    def events():
+        last_seq = since
+        started = last_sent = time.monotonic()
+        # Ask EventSource clients to reconnect shortly after we close the stream
+        yield f"retry: {int(poll_interval * 1000)}\n\n"
+        while True:
+            seq = Item.current_seq()
+            now = time.monotonic()
+            if seq != last_seq:
+                last_seq, last_sent = seq, now
+                yield f"id: {seq}\nevent: changes\ndata: {json.dumps({'seq': seq})}\n\n"
+            elif now - last_sent >= heartbeat_interval:
+                last_sent = now
+                yield ": keep-alive\n\n"
+            if now - started >= max_duration:
+                return
+            time.sleep(poll_interval)
+
+    return Response(
+        stream_with_context(events()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+
+@api_bp.route("/items/import", methods=["POST"])
+@jwt_required()
+def import_items():
+    """Bulk import items from a CSV or NDJSON request body (authentication required)"""
+    from app.utils import bulk
+    
+    fmt = bulk.detect_format(request.args.get('format'), request.content_type)
+    if not fmt:
+        return jsonify({"error": "Format must be csv or ndjson"}), 400
+
+    try:
+        text_stream = bulk.text_stream(request.stream)
+        with get_db_connection() as conn:
+            report = bulk.import_items(
+                conn,
+                bulk.read_rows(text_stream, fmt),
+                chunk_size=current_app.config['ITEM_IMPORT_CHUNK_SIZE'],
+                max_reported=current_app.config['ITEM_IMPORT_MAX_REJECTED_REPORTED']
+            )
+        Item.forget_reads()
+        if 'aborted' in report:
+            # Chunks committed before the failure stay imported; say how many
+            status = 400 if report['aborted']['cause'] == 'input' else 500
+            return jsonify({"error": "Import stopped part-way", **report}), status
+        return jsonify(report)
+    except Exception as e:
+        return jsonify({"error": "Failed to import items"}), 500
+
+
+@api_bp.route("/items/export", methods=["GET"])
+@jwt_required()
+def export_items():
+    """Stream all items as CSV or NDJSON (authentication required)"""
+    from app.utils import bulk
+    
+    fmt = bulk.detect_format(request.args.get('format', 'csv'))
+    if not fmt:
+        return jsonify({"error": "Format must be csv or ndjson"}), 400
+
+    batch_size = current_app.config['ITEM_EXPORT_BATCH_SIZE']
+
+    def generate():
+        report = {}
+        with get_db_connection() as conn:
+            yield from bulk.export_items(conn, fmt, batch_size=batch_size, report=report)
+        current_app.logger.info(
+            "Exported %s items in %ss (%s rows/s)",
+            report['exported'], report['seconds'], report['rows_per_second']
+        )
+
+    mimetype = 'text/csv' if fmt == 'csv' else 'application/x-ndjson'
+    return Response(
+        stream_with_context(generate()),
+        mimetype=mimetype,
+        headers={'Content-Disposition': f'attachment; filename=items.{fmt}'}
+    )
+
+
 @api_bp.route("/items/<int:item_id>", methods=["GET"])
 @jwt_required()
 def get_item(item_id):
-    """Get a specific item by ID (authentication required)"""
-    try:
-        item = Item.find_by_id(item_id)
+    """Get a specific item by ID, optionally only ?fields=a,b (authentication required)"""
+    fields, errors = parse_fields(request.args.get('fields'), Item.FIELDS)
+    if errors:
+        return jsonify({"errors": errors}), 400
+    
+    def load():
+        if fields:
+            item = Item.get_fields_by_id(item_id, fields)
+        else:
+            item = Item.find_by_id(item_id)
         
         if not item:
-            return jsonify({"error": f"Item with id {item_id} not found"}), 404
+            return {"error": f"Item with id {item_id} not found"}, 404
         
-        return jsonify(item.to_dict())
+        return (item if fields else item.to_dict()), 200
+    
+    try:
+        return coalesced_json(('item', item_id, tuple(fields or ())), load)
         
     except Exception as e:
         return jsonify({"error": "Failed to fetch item"}), 500
@@ -72,10 +262,6 @@ def update_item(item_id):
         if not data:
             return jsonify({"error": "JSON data is required"}), 400
         
-        item = Item.find_by_id(item_id)
-        if not item:
-            return jsonify({"error": f"Item with id {item_id} not found"}), 404
-        
         # Validate data for update
         errors = validate_item_data(data, is_update=True)
         if errors:
@@ -90,11 +276,11 @@ def update_item(item_id):
         if 'price' in data:
             update_data['price'] = float(data['price'])
         
-        if not update_data:
-            # No fields to update, return existing item
-            return jsonify(item.to_dict())
+        # Single UPDATE ... RETURNING; with no fields this is a plain lookup
+        item = Item.update_by_id(item_id, **update_data)
+        if not item:
+            return jsonify({"error": f"Item with id {item_id} not found"}), 404
         
-        item.update(**update_data)
         return jsonify(item.to_dict())
         
     except Exception as e:
@@ -106,12 +292,9 @@ def update_item(item_id):
 def delete_item(item_id):
     """Delete an item by ID (authentication required)"""
     try:
-        item = Item.find_by_id(item_id)
-        
-        if not item:
+        if not Item.delete_by_id(item_id):
             return jsonify({"error": f"Item with id {item_id} not found"}), 404
         
-        item.delete()
         return '', 204
         
     except Exception as e:
@@ -0,0 +1,86 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from flask_jwt_extended import JWTManager
+
+
+class TokenCache:
+    """Bounded LRU cache of verified JWT claims, keyed by a digest of the encoded token"""
+
+    def __init__(self, max_size=1024):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(encoded_token):
+        return hashlib.sha256(encoded_token.encode()).digest()
+
+    def get(self, encoded_token):
+        """Return cached claims for a token that has not yet expired, else None"""
+        key = self.key(encoded_token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                claims, expires_at = entry
+                if expires_at is None or expires_at > time.time():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return claims
+                # Expired: drop it so the full decode raises the usual error
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, encoded_token, claims):
+        key = self.key(encoded_token)
+        with self._lock:
+            self._entries[key] = (claims, claims.get('exp'))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else None
+            }
+
+
+class CachingJWTManager(JWTManager):
+    """JWTManager that skips signature verification and claim decoding for recently verified tokens
+
+    Only successful decodes are cached, and only until the token's ``exp``.
+    The blocklist loader still runs on every request, so a revoked token is
+    rejected immediately even while its claims are cached.
+    """
+
+    def __init__(self, app=None, max_size=1024, **kwargs):
+        self.token_cache = TokenCache(max_size)
+        super().__init__(app, **kwargs)
+
+    def _decode_jwt_from_config(self, encoded_token, csrf_value=None, allow_expired=False):
+        # CSRF double-submit and allow_expired decodes depend on more than the token
+        if csrf_value is not None or allow_expired:
+            return super()._decode_jwt_from_config(encoded_token, csrf_value, allow_expired)
+
+        claims = self.token_cache.get(encoded_token)
+        if claims is None:
+            claims = super()._decode_jwt_from_config(encoded_token)
+            self.token_cache.put(encoded_token, claims)
+        return dict(claims)
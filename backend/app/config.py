@@ -8,9 +8,110 @@ class Config:
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY', 'olXVKbR-j_CmEDuvLfnVMKTroEo_8_SRdBZDEhqDQpI')
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=1)
     JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=30)
+    # Only views that opt in (the item event stream) read tokens from ?token=
+    JWT_QUERY_STRING_NAME = 'token'
+    # Opt-in cache of verified token claims (see app/auth/token_cache.py)
+    JWT_CACHE_ENABLED = os.environ.get('JWT_CACHE_ENABLED', 'false').lower() == 'true'
+    JWT_CACHE_MAX_SIZE = int(os.environ.get('JWT_CACHE_MAX_SIZE', 1024))
+    # /metrics needs a user's access token, or this shared secret as the bearer
+    # token so monitoring can scrape it without logging in
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
     DATABASE_PATH = "items.db"
+    # Optional prebuilt database that new, empty databases are cloned from
+    DATABASE_TEMPLATE_PATH = os.environ.get('DATABASE_TEMPLATE_PATH')
+    # Bytes a WAL file is cut back to whenever a checkpoint lets writers
+    # start over at its beginning, so a burst of writes does not leave it
+    # large for good
+    DATABASE_JOURNAL_SIZE_LIMIT = 4 * 1024 * 1024
+
+    # Startup: build the suggest index and read the first rows of the item
+    # listing into the OS file cache before /ready reports ready, in a
+    # background thread so the process can serve / immediately
+    WARMUP_IN_BACKGROUND = True
+    WARMUP_PAGE_CACHE_ITEMS = int(os.environ.get('WARMUP_PAGE_CACHE_ITEMS', 200))
     CORS_ORIGINS = os.environ.get('CORS_ORIGINS', 'http://localhost:3000').split(',')
 
+    # Lower bounds of the price histogram served by /api/items/stats
+    ITEM_PRICE_BUCKETS = [0, 10, 50, 100, 500, 1000]
+
+    # Delta sync: page size of /api/items/changes and polling of /api/items/stream
+    ITEM_CHANGES_DEFAULT_LIMIT = 500
+    ITEM_CHANGES_MAX_LIMIT = 5000
+    ITEM_STREAM_POLL_INTERVAL = 1.0
+    ITEM_STREAM_HEARTBEAT_INTERVAL = 15.0
+    ITEM_STREAM_MAX_DURATION = 300
+    # EventSource cannot send an Authorization header, so browsers open the
+    # stream with a short-lived token from POST /api/items/stream/token
+    ITEM_STREAM_TOKEN_EXPIRES = timedelta(minutes=1)
+
+    # Bulk import/export: rows per INSERT transaction and per streamed chunk
+    ITEM_IMPORT_CHUNK_SIZE = 1000
+    ITEM_IMPORT_MAX_REJECTED_REPORTED = 100
+    ITEM_EXPORT_BATCH_SIZE = 1000
+
+    # Typeahead (/api/items/suggest): result cap, how often the in-memory
+    # index checks for changes made by other workers (seconds) and how many
+    # changes it applies from the change log before rebuilding instead
+    SUGGEST_DEFAULT_LIMIT = 10
+    SUGGEST_MAX_LIMIT = 50
+    SUGGEST_CHECK_INTERVAL = 1.0
+    SUGGEST_CATCH_UP_LIMIT = 1000
+
+    # Request coalescing for item reads: keys with per-key metrics kept
+    SINGLE_FLIGHT_TRACKED_KEYS = 1024
+
+    # Database maintenance (planner statistics, WAL checkpoint, incremental
+    # vacuum): due every MAINTENANCE_INTERVAL seconds, run at the first check
+    # with no more than MAINTENANCE_IDLE_MAX_REQUESTS requests since the one
+    # before, or regardless after MAINTENANCE_MAX_DELAY; each step is capped
+    # at MAINTENANCE_STEP_TIME_BUDGET seconds. Runs in a quiet period also
+    # truncate the WAL file to zero bytes
+    MAINTENANCE_ENABLED = os.environ.get('MAINTENANCE_ENABLED', 'true').lower() == 'true'
+    MAINTENANCE_INTERVAL = int(os.environ.get('MAINTENANCE_INTERVAL', 900))
+    MAINTENANCE_CHECK_INTERVAL = 30
+    MAINTENANCE_MAX_DELAY = 4 * 3600
+    MAINTENANCE_IDLE_MAX_REQUESTS = int(os.environ.get('MAINTENANCE_IDLE_MAX_REQUESTS', 5))
+    MAINTENANCE_STEP_TIME_BUDGET = 0.2
+    MAINTENANCE_ANALYSIS_LIMIT = 400
+    MAINTENANCE_ANALYZE_MIN_CHANGES = 1000
+    MAINTENANCE_VACUUM_BATCH_PAGES = 64
+
+    # Background jobs: worker threads per process and queued + running cap
+    JOB_WORKERS = int(os.environ.get('JOB_WORKERS', 2))
+    JOB_MAX_PENDING = int(os.environ.get('JOB_MAX_PENDING', 20))
+    # Job types any signed-in user may submit. Everything else (reindex and
+    # vacuum hold the write lock while they run) is for operators, who may
+    # also view and cancel any job; other users only see their own
+    JOB_USER_TYPES = ['recompute_stats']
+    JOB_OPERATOR_EMAILS = [email for email in os.environ.get('JOB_OPERATOR_EMAILS', '').split(',') if email]
+
+    # Admission control: concurrent requests per route class in each process,
+    # how many more may wait for a slot, and for how long (seconds) before a 503.
+    # Limits are shares of the gunicorn threads per worker (WEB_THREADS, see
+    # render.yaml): a request waiting for a slot also holds a thread, so limits
+    # and queues together leave a few threads free to turn excess requests
+    # away instead of letting them queue inside gunicorn
+    ADMISSION_CONTROL_ENABLED = os.environ.get('ADMISSION_CONTROL_ENABLED', 'true').lower() == 'true'
+    WEB_THREADS = int(os.environ.get('WEB_THREADS', 16))
+    ADMISSION_LIMITS = {
+        # Login and register only: each spends ~0.2s hashing a password, so
+        # few run at once but a burst of them can wait its turn
+        'auth': {'limit': max(1, WEB_THREADS // 8), 'max_queue': max(2, WEB_THREADS // 4), 'queue_timeout': 2.0},
+        'items_read': {'limit': max(1, WEB_THREADS // 4), 'max_queue': max(1, WEB_THREADS // 16), 'queue_timeout': 1.0},
+        'items_write': {'limit': max(1, WEB_THREADS // 8), 'max_queue': max(1, WEB_THREADS // 16), 'queue_timeout': 2.0},
+        # Each open stream holds a worker thread for up to ITEM_STREAM_MAX_DURATION
+        'items_stream': {'limit': max(1, WEB_THREADS // 16), 'max_queue': 0, 'queue_timeout': 0.0},
+    }
+    ADMISSION_RETRY_AFTER = 1
+    # Endpoints limited by their own class; the cheap auth endpoints (/me,
+    # /refresh, /logout) count as items_read
+    ADMISSION_ENDPOINT_CLASSES = {
+        'auth.login': 'auth',
+        'auth.register': 'auth',
+        'api.stream_item_changes': 'items_stream',
+    }
+    ADMISSION_EXEMPT_ENDPOINTS = []
+
 
 class DevelopmentConfig(Config):
     """Development configuration"""
@@ -28,6 +129,8 @@ class TestingConfig(Config):
     """Testing configuration"""
     TESTING = True
     DATABASE_PATH = ":memory:"
+    WARMUP_PAGE_CACHE_ITEMS = 0
+    MAINTENANCE_ENABLED = False
 
 
 config = {
@@ -0,0 +1,82 @@
+from flask import current_app
+from app.utils.database import get_db_connection
+from app.utils.maintenance import incremental_vacuum
+from app.utils.stats import recompute_item_stats, validate_item_stats
+
+
+def recompute_stats(ctx):
+    """Rebuild the item statistics summary from a full scan, then validate it"""
+    buckets = current_app.config['ITEM_PRICE_BUCKETS']
+    with get_db_connection() as conn:
+        recompute_item_stats(conn, buckets)
+        ctx.progress(1, 2)
+        errors = validate_item_stats(conn, buckets)
+    return {'errors': errors}
+
+
+def reindex(ctx):
+    """Rebuild every index one at a time, then refresh planner statistics"""
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL ORDER BY name")
+        indexes = [row['name'] for row in cursor.fetchall()]
+
+        for done, name in enumerate(indexes):
+            ctx.progress(done, len(indexes) + 1)
+            cursor.execute(f"REINDEX {name}")
+            conn.commit()
+
+        ctx.progress(len(indexes), len(indexes) + 1)
+        cursor.execute("ANALYZE")
+        conn.commit()
+    return {'indexes': indexes}
+
+
+def vacuum(ctx, full=False):
+    """Return free pages to the file system
+
+    By default this is an incremental vacuum in batches, each one a short
+    write transaction time-boxed like scheduled maintenance, with progress
+    and cancellation checks in between. `full=True` runs VACUUM instead,
+    which rebuilds the whole file (and moves a database created before
+    incremental auto-vacuum onto it): it holds the write lock from start to
+    finish and cannot be cancelled part-way, so request writes wait and fail
+    after the busy timeout until it completes.
+    """
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("PRAGMA page_count")
+        pages_before = cursor.fetchone()[0]
+        ctx.check_cancelled()
+
+        if full:
+            cursor.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            cursor.execute("VACUUM")
+        else:
+            cursor.execute("PRAGMA auto_vacuum")
+            if cursor.fetchone()[0] != 2:
+                raise ValueError("Incremental vacuum is not enabled on this database; run with full=true once")
+            cursor.execute("PRAGMA freelist_count")
+            free_pages = total = cursor.fetchone()[0]
+            while free_pages:
+                ctx.progress(total - free_pages, total)
+                report = incremental_vacuum(
+                    conn,
+                    current_app.config['MAINTENANCE_STEP_TIME_BUDGET'],
+                    current_app.config['MAINTENANCE_VACUUM_BATCH_PAGES']
+                )
+                if report['timed_out'] and not report['pages_freed']:
+                    # Not even one batch fits in the time box: leave the rest
+                    break
+                free_pages = report['free_pages']
+
+        cursor.execute("PRAGMA page_count")
+        pages_after = cursor.fetchone()[0]
+    return {'pages_before': pages_before, 'pages_after': pages_after, 'full': full}
+
+
+JOB_HANDLERS = {
+    'recompute_stats': recompute_stats,
+    'reindex': reindex,
+    'vacuum': vacuum,
+}
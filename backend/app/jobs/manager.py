@@ -0,0 +1,167 @@
+import inspect
+import os
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from app.models.job import Job
+
+
+class JobCancelled(Exception):
+    """Raised inside a job handler when cancellation has been requested"""
+
+
+class JobQueueFull(Exception):
+    """Raised when the number of queued and running jobs has reached JOB_MAX_PENDING"""
+
+
+class JobContext:
+    """Handed to job handlers to report progress and check for cancellation"""
+
+    def __init__(self, job_id, cancel_event, progress_interval):
+        self.job_id = job_id
+        self._cancel_event = cancel_event
+        self._progress_interval = progress_interval
+        self._last_progress = 0.0
+
+    def progress(self, done, total=1):
+        """Record progress (throttled) and raise JobCancelled if the job was cancelled"""
+        now = time.monotonic()
+        if now - self._last_progress >= self._progress_interval or done >= total:
+            self._last_progress = now
+            # The flag in the table also covers cancels handled by another worker process
+            if Job.set_progress(self.job_id, round(done / total, 4) if total else 1.0):
+                self._cancel_event.set()
+        self.check_cancelled()
+
+    def check_cancelled(self):
+        if self._cancel_event.is_set():
+            raise JobCancelled()
+
+
+class JobManager:
+    """Runs registered job handlers on a bounded thread pool, persisting state in the jobs table
+
+    Handlers are plain functions ``handler(ctx, **params)`` that return a
+    JSON-serialisable result. They should work in chunks and call
+    ``ctx.progress()`` between them so cancellation is honoured and no single
+    transaction holds the database for long.
+    """
+
+    def __init__(self, app, handlers, max_workers=2, max_pending=20, progress_interval=0.5):
+        self.app = app
+        self.handlers = handlers
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.progress_interval = progress_interval
+        # Identifies jobs owned by this process, to detect ones a restart interrupted
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='job')
+        self._lock = threading.Lock()
+        self._pending = {}
+        self.submitted = 0
+        self.rejected = 0
+
+    def param_errors(self, job_type, params):
+        """Check params against the handler's keyword arguments; returns a list of errors"""
+        signature = inspect.signature(self.handlers[job_type])
+        accepted = {
+            name: parameter for name, parameter in list(signature.parameters.items())[1:]
+            if parameter.kind in (parameter.POSITIONAL_OR_KEYWORD, parameter.KEYWORD_ONLY)
+        }
+        errors = []
+        for name, value in params.items():
+            parameter = accepted.get(name)
+            if parameter is None:
+                allowed = ', '.join(accepted) or 'none'
+                errors.append(f"Unknown parameter '{name}' for {job_type} (accepted: {allowed})")
+            elif parameter.default not in (parameter.empty, None) and not isinstance(value, type(parameter.default)):
+                errors.append(f"Parameter '{name}' must be of type {type(parameter.default).__name__}")
+        for name, parameter in accepted.items():
+            if parameter.default is parameter.empty and name not in params:
+                errors.append(f"Parameter '{name}' is required for {job_type}")
+        return errors
+
+    def submit(self, job_type, params=None, created_by=None):
+        """Queue a job and return its id"""
+        if job_type not in self.handlers:
+            raise KeyError(job_type)
+
+        with self._lock:
+            if len(self._pending) >= self.max_pending:
+                self.rejected += 1
+                raise JobQueueFull()
+            job = Job.create(job_type, params or {}, self.owner, created_by)
+            cancel_event = threading.Event()
+            future = self._executor.submit(self._run, job.id, job_type, params or {}, cancel_event)
+            self._pending[job.id] = (future, cancel_event)
+            self.submitted += 1
+
+        future.add_done_callback(lambda _: self._forget(job.id))
+        return job.id
+
+    def cancel(self, job_id):
+        """Request cancellation; queued jobs never start, running ones stop at their next progress call"""
+        Job.request_cancel(job_id)
+        with self._lock:
+            pending = self._pending.get(job_id)
+        if pending:
+            future, cancel_event = pending
+            cancel_event.set()
+            future.cancel()
+
+    def recover(self):
+        """Fail unfinished jobs left behind by processes on this host that are no longer running"""
+        host = socket.gethostname()
+        dead = [
+            owner for owner in Job.unfinished_owners()
+            if owner and owner != self.owner and owner.rsplit(':', 1)[0] == host
+            and not _pid_alive(int(owner.rsplit(':', 1)[1]))
+        ]
+        return Job.fail_unfinished(dead, "Interrupted by a restart")
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            pending = list(self._pending.values())
+        for future, cancel_event in pending:
+            cancel_event.set()
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'workers': self.max_workers,
+                'pending': len(self._pending),
+                'max_pending': self.max_pending,
+                'submitted': self.submitted,
+                'rejected': self.rejected
+            }
+
+    def _forget(self, job_id):
+        with self._lock:
+            self._pending.pop(job_id, None)
+
+    def _run(self, job_id, job_type, params, cancel_event):
+        with self.app.app_context():
+            if not Job.mark_running(job_id):
+                return
+            ctx = JobContext(job_id, cancel_event, self.progress_interval)
+            try:
+                result = self.handlers[job_type](ctx, **params)
+            except JobCancelled:
+                Job.finish(job_id, 'cancelled')
+            except Exception as e:
+                self.app.logger.exception("Job %s (%s) failed", job_id, job_type)
+                Job.finish(job_id, 'failed', error=str(e) or e.__class__.__name__)
+            else:
+                Job.finish(job_id, 'succeeded', result=result)
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
@@ -0,0 +1,89 @@
+from flask import Blueprint, current_app, request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from app.jobs.manager import JobQueueFull
+from app.models.job import Job
+from app.models.user import User
+
+jobs_bp = Blueprint('jobs', __name__, url_prefix='/api/jobs')
+
+
+def get_job_manager():
+    return current_app.extensions['job_manager']
+
+
+def is_operator(user_id):
+    """Whether the user may run any job type and manage other users' jobs (JOB_OPERATOR_EMAILS)"""
+    user = User.find_by_id(user_id)
+    return user is not None and user.email in current_app.config['JOB_OPERATOR_EMAILS']
+
+
+def can_manage(job, user_id):
+    return job.created_by == user_id or is_operator(user_id)
+
+
+@jobs_bp.route("", methods=["POST"])
+@jwt_required()
+def submit_job():
+    """Submit a background job (authentication required)"""
+    data = request.get_json(silent=True)
+    if not data or not data.get('type'):
+        return jsonify({"error": "Job type is required"}), 400
+
+    manager = get_job_manager()
+    if data['type'] not in manager.handlers:
+        return jsonify({
+            "error": f"Unknown job type '{data['type']}'. Available: {', '.join(sorted(manager.handlers))}"
+        }), 400
+
+    user_id = get_jwt_identity()
+    if data['type'] not in current_app.config['JOB_USER_TYPES'] and not is_operator(user_id):
+        return jsonify({"error": f"Only operators may run {data['type']} jobs"}), 403
+
+    params = data.get('params') or {}
+    if not isinstance(params, dict):
+        return jsonify({"error": "params must be an object"}), 400
+    errors = manager.param_errors(data['type'], params)
+    if errors:
+        return jsonify({"errors": errors}), 400
+
+    try:
+        job_id = manager.submit(data['type'], params, created_by=user_id)
+    except JobQueueFull:
+        return jsonify({"error": "Too many jobs are queued, try again later"}), 503, {'Retry-After': '30'}
+    except Exception as e:
+        return jsonify({"error": "Failed to submit job"}), 500
+
+    job = Job.find_by_id(job_id)
+    return jsonify(job.to_dict()), 202, {'Location': f'/api/jobs/{job_id}'}
+
+
+@jobs_bp.route("/<job_id>", methods=["GET"])
+@jwt_required()
+def get_job(job_id):
+    """Get the status, progress and result of a job (authentication required)"""
+    try:
+        job = Job.find_by_id(job_id)
+
+        if not job or not can_manage(job, get_jwt_identity()):
+            return jsonify({"error": f"Job with id {job_id} not found"}), 404
+
+        return jsonify(job.to_dict())
+
+    except Exception as e:
+        return jsonify({"error": "Failed to fetch job"}), 500
+
+
+@jobs_bp.route("/<job_id>/cancel", methods=["POST"])
+@jwt_required()
+def cancel_job(job_id):
+    """Cancel a queued or running job (authentication required)"""
+    try:
+        job = Job.find_by_id(job_id)
+        if not job or not can_manage(job, get_jwt_identity()):
+            return jsonify({"error": f"Job with id {job_id} not found"}), 404
+
+        get_job_manager().cancel(job_id)
+        return jsonify(Job.find_by_id(job_id).to_dict()), 202
+
+    except Exception as e:
+        return jsonify({"error": "Failed to cancel job"}), 500
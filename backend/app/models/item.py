@@ -1,7 +1,17 @@
+from flask import current_app
 from app.utils.database import get_db_connection
+from app.utils.stats import read_item_stats
 
 
 class Item:
+    # Columns that can be requested with ?fields=, in output order
+    FIELDS = ('id', 'name', 'description', 'price', 'seq', 'updated_at')
+    # What an item looks like without ?fields= (see to_dict); the change
+    # tracking columns are only returned when asked for
+    DEFAULT_FIELDS = ('id', 'name', 'description', 'price')
+    # Columns that can be written through update_by_id
+    UPDATABLE_FIELDS = ('name', 'description', 'price')
+
     def __init__(self, id=None, name=None, description=None, price=None):
         self.id = id
         self.name = name
@@ -9,14 +19,24 @@ class Item:
         self.price = price
 
     @staticmethod
-    def get_all():
-        """Get all items"""
+    def get_all(fields=None):
+        """Get all items as DEFAULT_FIELDS, or projected to a subset of FIELDS"""
+        columns = ', '.join(fields or Item.DEFAULT_FIELDS)
         with get_db_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT * FROM items ORDER BY id")
+            cursor.execute(f"SELECT {columns} FROM items ORDER BY id")
             rows = cursor.fetchall()
             return [dict(row) for row in rows]
 
+    @staticmethod
+    def get_fields_by_id(item_id, fields):
+        """Get a subset of FIELDS for one item as a dictionary, or None if it does not exist"""
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT {', '.join(fields)} FROM items WHERE id = ?", (item_id,))
+            row = cursor.fetchone()
+            return dict(row) if row else None
+
     @staticmethod
     def find_by_id(item_id):
         """Find item by ID"""
@@ -24,14 +44,166 @@ class Item:
             cursor = conn.cursor()
             cursor.execute("SELECT * FROM items WHERE id = ?", (item_id,))
             row = cursor.fetchone()
+            return Item.from_row(row) if row else None
+
+    @staticmethod
+    def update_by_id(item_id, **fields):
+        """Write only the given fields and return the updated item, or None if it does not exist"""
+        fields = {key: value for key, value in fields.items() if key in Item.UPDATABLE_FIELDS}
+        if not fields:
+            return Item.find_by_id(item_id)
+
+        assignments = ', '.join(f"{key} = ?" for key in fields)
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"UPDATE items SET {assignments} WHERE id = ? RETURNING id, name, description, price",
+                (*fields.values(), item_id)
+            )
+            row = cursor.fetchone()
+            notify = Item._index_change(conn, row['id'], row['name']) if row else None
+            conn.commit()
+            if notify:
+                notify()
             if row:
-                return Item(
-                    id=row['id'],
-                    name=row['name'],
-                    description=row['description'],
-                    price=row['price']
-                )
+                Item.forget_reads(item_id)
+            return Item.from_row(row) if row else None
+
+    @staticmethod
+    def delete_by_id(item_id):
+        """Delete item by ID and return whether it existed"""
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM items WHERE id = ?", (item_id,))
+            deleted = cursor.rowcount > 0
+            notify = Item._index_change(conn, item_id, deleted=True) if deleted else None
+            conn.commit()
+            if notify:
+                notify()
+            if deleted:
+                Item.forget_reads(item_id)
+            return deleted
+
+    @staticmethod
+    def from_row(row):
+        """Build an Item from a database row"""
+        return Item(
+            id=row['id'],
+            name=row['name'],
+            description=row['description'],
+            price=row['price']
+        )
+
+    @staticmethod
+    def get_stats():
+        """Get precomputed item statistics"""
+        with get_db_connection() as conn:
+            return read_item_stats(conn)
+
+    @staticmethod
+    def prime_page_cache(limit):
+        """Read the first pages of the item listing and the statistics from disk
+
+        SQLite's own page cache belongs to a connection and goes when it is
+        closed, so what this warms is the operating system's file cache: after
+        a cold start the first requests then read memory instead of disk.
+        Returns the number of item rows read.
+        """
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT {', '.join(Item.DEFAULT_FIELDS)} FROM items ORDER BY id LIMIT ?", (limit,))
+            rows = len(cursor.fetchall())
+            cursor.execute("SELECT id, name, price FROM items ORDER BY id LIMIT ?", (limit,))
+            cursor.fetchall()
+            read_item_stats(conn)
+            return rows
+
+    @staticmethod
+    def current_seq():
+        """Get the sequence number of the most recent item change"""
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT value FROM item_sequence WHERE id = 1")
+            row = cursor.fetchone()
+            return row['value'] if row else 0
+
+    @staticmethod
+    def load_names():
+        """Get the current sequence number and every (id, name), read from one snapshot"""
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("BEGIN")
+            cursor.execute("SELECT value FROM item_sequence WHERE id = 1")
+            row = cursor.fetchone()
+            seq = row['value'] if row else 0
+            cursor.execute("SELECT id, name FROM items")
+            rows = [(row['id'], row['name']) for row in cursor.fetchall()]
+            conn.commit()
+            return seq, rows
+
+    @staticmethod
+    def suggest(prefix, limit):
+        """Get up to `limit` items whose name, or a word in it, starts with `prefix`"""
+        index = current_app.extensions['suggest_index']
+        return [{'id': item_id, 'name': name} for item_id, name in index.search(prefix, limit)]
+
+    @staticmethod
+    def _index_change(conn, item_id, name=None, deleted=False):
+        """Prepare the suggestion index update for a write on `conn`; call the result after commit"""
+        index = current_app.extensions.get('suggest_index')
+        if index is None:
             return None
+        # Still inside the write transaction, so this is the write's own sequence number
+        seq = conn.execute("SELECT value FROM item_sequence WHERE id = 1").fetchone()[0]
+        if deleted:
+            return lambda: index.apply_delete(item_id, seq)
+        return lambda: index.apply_upsert(item_id, name, seq)
+
+    @staticmethod
+    def forget_reads(item_id=None):
+        """After a committed write, stop later requests joining coalesced reads that started before it
+
+        Drops the listing reads and, when given, the reads of one item; see
+        coalesced_json in app/api/routes.py for the key layout.
+        """
+        single_flight = current_app.extensions.get('single_flight')
+        if single_flight is not None:
+            single_flight.forget(
+                lambda key: key[0] == 'items' or (key[0] == 'item' and key[1] == item_id)
+            )
+
+    @staticmethod
+    def get_changes(since, limit):
+        """Get items changed and ids deleted after sequence number `since`, oldest first"""
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            # One snapshot for both logs: a write committed between the two
+            # reads would otherwise move the cursor past changes never sent
+            cursor.execute("BEGIN")
+            cursor.execute(
+                "SELECT id, name, description, price, seq, updated_at FROM items "
+                "WHERE seq > ? ORDER BY seq LIMIT ?",
+                (since, limit + 1)
+            )
+            changes = [('item', dict(row)) for row in cursor.fetchall()]
+            cursor.execute(
+                "SELECT item_id, seq FROM item_tombstones WHERE seq > ? ORDER BY seq LIMIT ?",
+                (since, limit + 1)
+            )
+            changes += [('deleted', dict(row)) for row in cursor.fetchall()]
+            conn.commit()
+
+        # Merge both logs by sequence number and cut the page at `limit`
+        changes.sort(key=lambda change: change[1]['seq'])
+        has_more = len(changes) > limit
+        changes = changes[:limit]
+
+        return {
+            'items': [row for kind, row in changes if kind == 'item'],
+            'deleted': [row['item_id'] for kind, row in changes if kind == 'deleted'],
+            'seq': changes[-1][1]['seq'] if changes else since,
+            'has_more': has_more
+        }
 
     def save(self):
         """Save item to database"""
@@ -50,7 +222,12 @@ class Item:
                     "UPDATE items SET name = ?, description = ?, price = ? WHERE id = ?",
                     (self.name, self.description, self.price, self.id)
                 )
+            notify = Item._index_change(conn, self.id, self.name) if cursor.rowcount else None
             conn.commit()
+            if notify:
+                notify()
+            if cursor.rowcount:
+                Item.forget_reads(self.id)
             return self
 
     def update(self, **kwargs):
@@ -58,20 +235,21 @@ class Item:
         for key, value in kwargs.items():
             if hasattr(self, key):
                 setattr(self, key, value)
-        return self.save()
+        if self.id is None:
+            return self.save()
+        updated = Item.update_by_id(self.id, **kwargs)
+        if updated:
+            self.name, self.description, self.price = updated.name, updated.description, updated.price
+        return self
 
     def delete(self):
         """Delete item from database"""
         if self.id:
-            with get_db_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("DELETE FROM items WHERE id = ?", (self.id,))
-                conn.commit()
-                return True
+            return Item.delete_by_id(self.id)
         return False
 
     def to_dict(self):
-        """Convert item to dictionary"""
+        """Convert item to dictionary (DEFAULT_FIELDS)"""
         return {
             'id': self.id,
             'name': self.name,
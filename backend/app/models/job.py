@@ -0,0 +1,159 @@
+import json
+import uuid
+from app.utils.database import get_db_connection
+
+
+class Job:
+    # Statuses a job can no longer leave
+    FINISHED_STATUSES = ('succeeded', 'failed', 'cancelled')
+
+    def __init__(self, id=None, type=None, params=None, status='queued', progress=0.0,
+                 result=None, error=None, cancel_requested=False, owner=None, created_by=None,
+                 created_at=None, started_at=None, finished_at=None):
+        self.id = id
+        self.type = type
+        self.params = params or {}
+        self.status = status
+        self.progress = progress
+        self.result = result
+        self.error = error
+        self.cancel_requested = cancel_requested
+        self.owner = owner
+        self.created_by = created_by
+        self.created_at = created_at
+        self.started_at = started_at
+        self.finished_at = finished_at
+
+    @staticmethod
+    def find_by_id(job_id):
+        """Find job by ID"""
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM jobs WHERE id = ?", (job_id,))
+            row = cursor.fetchone()
+            if row:
+                return Job(
+                    id=row['id'],
+                    type=row['type'],
+                    params=json.loads(row['params']) if row['params'] else {},
+                    status=row['status'],
+                    progress=row['progress'],
+                    result=json.loads(row['result']) if row['result'] else None,
+                    error=row['error'],
+                    cancel_requested=bool(row['cancel_requested']),
+                    owner=row['owner'],
+                    created_by=row['created_by'],
+                    created_at=row['created_at'],
+                    started_at=row['started_at'],
+                    finished_at=row['finished_at']
+                )
+            return None
+
+    @staticmethod
+    def create(job_type, params, owner, created_by=None):
+        """Insert a new queued job"""
+        job = Job(id=uuid.uuid4().hex, type=job_type, params=params, owner=owner, created_by=created_by)
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "INSERT INTO jobs (id, type, params, status, owner, created_by) VALUES (?, ?, ?, ?, ?, ?)",
+                (job.id, job.type, json.dumps(job.params), job.status, job.owner, job.created_by)
+            )
+            conn.commit()
+        return job
+
+    @staticmethod
+    def mark_running(job_id):
+        """Move a queued job to running; returns False if it was cancelled first"""
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "UPDATE jobs SET status = 'running', started_at = CURRENT_TIMESTAMP "
+                "WHERE id = ? AND status = 'queued' AND cancel_requested = 0",
+                (job_id,)
+            )
+            started = cursor.rowcount > 0
+            conn.commit()
+            return started
+
+    @staticmethod
+    def set_progress(job_id, progress):
+        """Record progress and return whether cancellation has been requested"""
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "UPDATE jobs SET progress = ? WHERE id = ? RETURNING cancel_requested",
+                (progress, job_id)
+            )
+            row = cursor.fetchone()
+            conn.commit()
+            return bool(row and row['cancel_requested'])
+
+    @staticmethod
+    def finish(job_id, status, result=None, error=None):
+        """Record the final status of a job"""
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = CURRENT_TIMESTAMP, "
+                "progress = CASE WHEN ? = 'succeeded' THEN 1 ELSE progress END "
+                "WHERE id = ?",
+                (status, json.dumps(result) if result is not None else None, error, status, job_id)
+            )
+            conn.commit()
+
+    @staticmethod
+    def request_cancel(job_id):
+        """Flag a job for cancellation; queued jobs are cancelled straight away"""
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "UPDATE jobs SET cancel_requested = 1 WHERE id = ? AND status NOT IN (?, ?, ?)",
+                (job_id, *Job.FINISHED_STATUSES)
+            )
+            cursor.execute(
+                "UPDATE jobs SET status = 'cancelled', finished_at = CURRENT_TIMESTAMP "
+                "WHERE id = ? AND status = 'queued'",
+                (job_id,)
+            )
+            conn.commit()
+
+    @staticmethod
+    def fail_unfinished(owners, error):
+        """Mark queued or running jobs of the given owners as failed"""
+        if not owners:
+            return 0
+        placeholders = ', '.join('?' for _ in owners)
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"UPDATE jobs SET status = 'failed', error = ?, finished_at = CURRENT_TIMESTAMP "
+                f"WHERE status IN ('queued', 'running') AND owner IN ({placeholders})",
+                (error, *owners)
+            )
+            conn.commit()
+            return cursor.rowcount
+
+    @staticmethod
+    def unfinished_owners():
+        """Owners of jobs that are still queued or running"""
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT DISTINCT owner FROM jobs WHERE status IN ('queued', 'running')")
+            return [row['owner'] for row in cursor.fetchall()]
+
+    def to_dict(self):
+        """Convert job to dictionary"""
+        return {
+            'id': self.id,
+            'type': self.type,
+            'params': self.params,
+            'status': self.status,
+            'progress': self.progress,
+            'result': self.result,
+            'error': self.error,
+            'cancel_requested': self.cancel_requested,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at
+        }
@@ -0,0 +1,163 @@
+import csv
+import io
+import json
+import sqlite3
+import time
+from app.utils.validators import validate_item_data
+
+FORMATS = ('csv', 'ndjson')
+EXPORT_COLUMNS = ('id', 'name', 'description', 'price')
+
+
+def detect_format(explicit=None, content_type=None, filename=None):
+    """Work out the bulk format from an explicit value, a content type or a file name"""
+    if explicit:
+        return explicit.lower() if explicit.lower() in FORMATS else None
+    if content_type:
+        if 'csv' in content_type:
+            return 'csv'
+        if 'ndjson' in content_type or 'jsonl' in content_type:
+            return 'ndjson'
+    if filename:
+        if filename.endswith('.csv'):
+            return 'csv'
+        if filename.endswith(('.ndjson', '.jsonl')):
+            return 'ndjson'
+    return None
+
+
+def text_stream(binary_stream):
+    """Decode a binary request stream as UTF-8 text, line by line"""
+    return io.TextIOWrapper(binary_stream, encoding='utf-8', newline='')
+
+
+def read_rows(text_stream, fmt):
+    """Yield (line_number, row) pairs from a text stream; row is None when it cannot be parsed"""
+    if fmt == 'csv':
+        reader = csv.DictReader(text_stream)
+        for row in reader:
+            yield reader.line_num, row
+        return
+
+    for line_number, line in enumerate(text_stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            yield line_number, None
+            continue
+        yield line_number, row if isinstance(row, dict) else None
+
+
+def clean_row(row):
+    """Validate one imported row and return (values, errors)"""
+    if row is None:
+        return None, ["Row could not be parsed"]
+    try:
+        errors = validate_item_data(row)
+        if errors:
+            return None, errors
+        description = row.get('description') or ''
+        return (row['name'].strip(), description.strip(), float(row['price'])), []
+    except (AttributeError, TypeError):
+        return None, ["Fields have invalid types"]
+
+
+def import_items(conn, rows, chunk_size=1000, max_reported=100):
+    """Insert validated rows in chunked transactions and return an import report
+
+    If the input turns out to be unreadable or the database refuses a chunk,
+    the import stops there. Chunks already committed stay, and the report
+    says so under 'aborted' instead of raising.
+    """
+    started = time.perf_counter()
+    cursor = conn.cursor()
+    imported = 0
+    rejected = []
+    rejected_count = 0
+    chunk = []
+    line_number = 0
+    aborted = None
+
+    def flush():
+        cursor.executemany("INSERT INTO items (name, description, price) VALUES (?, ?, ?)", chunk)
+        conn.commit()
+        count = len(chunk)
+        chunk.clear()
+        return count
+
+    try:
+        for line_number, row in rows:
+            values, errors = clean_row(row)
+            if errors:
+                rejected_count += 1
+                if len(rejected) < max_reported:
+                    rejected.append({'line': line_number, 'errors': errors})
+                continue
+            chunk.append(values)
+            if len(chunk) >= chunk_size:
+                imported += flush()
+
+        if chunk:
+            imported += flush()
+    except UnicodeDecodeError:
+        aborted = {'cause': 'input', 'error': "Input must be UTF-8 encoded"}
+    except csv.Error as e:
+        aborted = {'cause': 'input', 'error': f"Malformed CSV: {e}"}
+    except sqlite3.Error as e:
+        aborted = {'cause': 'database', 'error': f"Database error: {e}"}
+
+    if aborted:
+        conn.rollback()
+        aborted['after_line'] = line_number
+
+    elapsed = time.perf_counter() - started
+    report = {
+        'imported': imported,
+        'rejected_count': rejected_count,
+        'rejected': rejected,
+        'seconds': round(elapsed, 3),
+        'rows_per_second': round((imported + rejected_count) / elapsed) if elapsed else None
+    }
+    if aborted:
+        report['aborted'] = aborted
+    return report
+
+
+def export_items(conn, fmt, batch_size=1000, report=None):
+    """Yield the items table as CSV or NDJSON text, one batch of rows per chunk"""
+    started = time.perf_counter()
+    cursor = conn.cursor()
+    cursor.execute(f"SELECT {', '.join(EXPORT_COLUMNS)} FROM items ORDER BY id")
+    exported = 0
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer) if fmt == 'csv' else None
+    if writer:
+        writer.writerow(EXPORT_COLUMNS)
+
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            break
+        for row in rows:
+            if writer:
+                writer.writerow(tuple(row))
+            else:
+                buffer.write(json.dumps(dict(zip(EXPORT_COLUMNS, row))) + '\n')
+        exported += len(rows)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue()
+
+    if report is not None:
+        elapsed = time.perf_counter() - started
+        report.update({
+            'exported': exported,
+            'seconds': round(elapsed, 3),
+            'rows_per_second': round(exported / elapsed) if elapsed else None
+        })
@@ -1,24 +1,121 @@
+import os
 import sqlite3
+import threading
+import uuid
 from contextlib import contextmanager
 from flask import current_app
 from werkzeug.security import generate_password_hash
 
+# Template databases built by _get_template, keyed by (path, price buckets)
+_templates = {}
+_templates_lock = threading.Lock()
+_memory_lock = threading.Lock()
+
 
 def init_db():
     """Initialize the SQLite database with items and users tables"""
-    conn = sqlite3.connect(current_app.config['DATABASE_PATH'])
+    conn = connect_db()
+    price_buckets = current_app.config['ITEM_PRICE_BUCKETS']
+
+    # A brand-new database is cloned from a prepared template rather than
+    # built (and password-hashed) from scratch
+    if _is_empty(conn):
+        clone_template(conn, current_app.config.get('DATABASE_TEMPLATE_PATH'), price_buckets)
+
+    # Readers no longer block the writer (or the other way round); the WAL
+    # is checkpointed by the maintenance scheduler (app/utils/maintenance.py)
+    if current_app.config['DATABASE_PATH'] != ':memory:':
+        conn.execute("PRAGMA journal_mode = WAL")
+
+    init_schema(conn, price_buckets)
+    seed_demo_data(conn)
+    conn.close()
+
+
+def seed_demo_data(conn):
+    """Add the demo user and sample items if there are no users yet"""
     cursor = conn.cursor()
-    
+
+    # Add demo user and sample data if database is empty
+    cursor.execute("SELECT COUNT(*) FROM users")
+    if cursor.fetchone()[0] == 0:
+        # Add demo user
+        demo_password_hash = generate_password_hash('demo123')
+        cursor.execute("""
+            INSERT INTO users (email, password_hash, name)
+            VALUES (?, ?, ?)
+        """, ('demo@example.com', demo_password_hash, 'Demo User'))
+
+        # Add sample items
+        cursor.execute("""
+            INSERT INTO items (name, description, price)
+            VALUES
+            ('Sample Laptop', 'A high-performance laptop for work and gaming', 999.99),
+            ('Wireless Headphones', 'Premium noise-cancelling headphones', 299.99),
+            ('Smart Watch', 'Fitness tracking and notifications', 199.99),
+            ('Coffee Maker', 'Automatic drip coffee maker', 89.99),
+            ('Desk Chair', 'Ergonomic office chair', 249.99)
+        """)
+
+        conn.commit()
+
+
+def _is_empty(conn):
+    cursor = conn.execute("SELECT COUNT(*) FROM sqlite_master")
+    return cursor.fetchone()[0] == 0
+
+
+def clone_template(conn, path, price_buckets):
+    """Copy a fully initialised template database into `conn` with the SQLite backup API
+
+    The template is built once per process. With `path` set it is also kept
+    on disk, so later boots (or other workers) clone it without building
+    anything.
+    """
+    key = (path, tuple(price_buckets))
+    with _templates_lock:
+        template = _templates.get(key)
+        if template is None:
+            template = sqlite3.connect(':memory:', check_same_thread=False)
+            if path and os.path.exists(path):
+                source = sqlite3.connect(path)
+                source.backup(template)
+                source.close()
+            else:
+                init_schema(template, price_buckets)
+                seed_demo_data(template)
+                if path:
+                    target = sqlite3.connect(path)
+                    template.backup(target)
+                    target.close()
+            _templates[key] = template
+        template.backup(conn)
+
+
+def init_schema(conn, price_buckets):
+    """Create tables, indexes and triggers (safe to run on an existing database)"""
+    cursor = conn.cursor()
+
+    # Free pages can be released a batch at a time by maintenance. Only takes
+    # effect on a new database; existing ones switch at their next VACUUM
+    cursor.execute("PRAGMA auto_vacuum = INCREMENTAL")
+
     # Create items table
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS items (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             name TEXT NOT NULL,
             description TEXT,
-            price REAL NOT NULL
+            price REAL NOT NULL,
+            seq INTEGER NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP
         )
     """)
-    
+
+    # Change tracking columns for databases created before they existed
+    _add_column_if_missing(cursor, 'items', 'seq', 'INTEGER NOT NULL DEFAULT 0')
+    _add_column_if_missing(cursor, 'items', 'updated_at', 'TIMESTAMP')
+
     # Create users table
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS users (
@@ -29,39 +126,249 @@ def init_db():
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )
     """)
-    
+
+    # Background jobs (see app/jobs)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS jobs (
+            id TEXT PRIMARY KEY,
+            type TEXT NOT NULL,
+            params TEXT,
+            status TEXT NOT NULL,
+            progress REAL NOT NULL DEFAULT 0,
+            result TEXT,
+            error TEXT,
+            cancel_requested INTEGER NOT NULL DEFAULT 0,
+            owner TEXT,
+            created_by TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            started_at TIMESTAMP,
+            finished_at TIMESTAMP
+        )
+    """)
+
+    # Single-row summary of the items table, maintained by triggers
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS item_stats (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            item_count INTEGER NOT NULL DEFAULT 0,
+            price_total REAL NOT NULL DEFAULT 0,
+            price_min REAL,
+            price_max REAL
+        )
+    """)
+
+    # Price histogram; upper_bound NULL means open-ended
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS item_price_buckets (
+            lower_bound REAL PRIMARY KEY,
+            upper_bound REAL,
+            item_count INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+
+    # MIN(price)/MAX(price) are single index seeks, used when the
+    # current minimum or maximum is deleted
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_items_price ON items(price)")
+
+    # Covering index for narrow listings (?fields=id,name,price), so they are
+    # answered without reading the description-heavy table pages
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_items_listing ON items(id, name, price)")
+
+    # Monotonic change counter shared by all item writes
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS item_sequence (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            value INTEGER NOT NULL
+        )
+    """)
+
+    # One row per deleted item, so delta sync can report deletions
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS item_tombstones (
+            item_id INTEGER PRIMARY KEY,
+            seq INTEGER NOT NULL,
+            deleted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_items_seq ON items(seq)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_item_tombstones_seq ON item_tombstones(seq)")
+
+    cursor.execute("SELECT COUNT(*) FROM item_sequence")
+    if cursor.fetchone()[0] == 0:
+        # Give pre-existing rows distinct sequence numbers so a client
+        # syncing from zero still receives them
+        cursor.execute("UPDATE items SET seq = id WHERE seq = 0")
+        cursor.execute("INSERT INTO item_sequence (id, value) SELECT 1, COALESCE(MAX(seq), 0) FROM items")
+
+    create_item_stats_triggers(cursor)
+    create_item_change_triggers(cursor)
+
     conn.commit()
-    
-    # Add demo user and sample data if database is empty
-    cursor.execute("SELECT COUNT(*) FROM users")
+
+    # Backfill the summary for databases created before it existed
+    cursor.execute("SELECT COUNT(*) FROM item_stats")
     if cursor.fetchone()[0] == 0:
-        # Add demo user
-        demo_password_hash = generate_password_hash('demo123')
-        cursor.execute("""
-            INSERT INTO users (email, password_hash, name)
-            VALUES (?, ?, ?)
-        """, ('demo@example.com', demo_password_hash, 'Demo User'))
-        
-        # Add sample items
-        cursor.execute("""
-            INSERT INTO items (name, description, price)
-            VALUES 
-            ('Sample Laptop', 'A high-performance laptop for work and gaming', 999.99),
-            ('Wireless Headphones', 'Premium noise-cancelling headphones', 299.99),
-            ('Smart Watch', 'Fitness tracking and notifications', 199.99),
-            ('Coffee Maker', 'Automatic drip coffee maker', 89.99),
-            ('Desk Chair', 'Ergonomic office chair', 249.99)
-        """)
-        
-        conn.commit()
-    
-    conn.close()
+        from app.utils.stats import recompute_item_stats
+        recompute_item_stats(conn, price_buckets)
+
+
+def create_item_stats_triggers(cursor):
+    """Create the triggers that keep item_stats and item_price_buckets current"""
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS items_stats_insert AFTER INSERT ON items
+        BEGIN
+            UPDATE item_stats SET
+                item_count = item_count + 1,
+                price_total = price_total + NEW.price,
+                price_min = CASE WHEN price_min IS NULL OR NEW.price < price_min
+                                 THEN NEW.price ELSE price_min END,
+                price_max = CASE WHEN price_max IS NULL OR NEW.price > price_max
+                                 THEN NEW.price ELSE price_max END
+            WHERE id = 1;
+            UPDATE item_price_buckets SET item_count = item_count + 1
+            WHERE NEW.price >= lower_bound
+              AND (upper_bound IS NULL OR NEW.price < upper_bound);
+        END
+    """)
+
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS items_stats_delete AFTER DELETE ON items
+        BEGIN
+            UPDATE item_stats SET
+                item_count = item_count - 1,
+                price_total = price_total - OLD.price,
+                price_min = CASE WHEN OLD.price <= price_min
+                                 THEN (SELECT MIN(price) FROM items) ELSE price_min END,
+                price_max = CASE WHEN OLD.price >= price_max
+                                 THEN (SELECT MAX(price) FROM items) ELSE price_max END
+            WHERE id = 1;
+            UPDATE item_price_buckets SET item_count = item_count - 1
+            WHERE OLD.price >= lower_bound
+              AND (upper_bound IS NULL OR OLD.price < upper_bound);
+        END
+    """)
+
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS items_stats_update AFTER UPDATE OF price ON items
+        WHEN OLD.price IS NOT NEW.price
+        BEGIN
+            UPDATE item_stats SET
+                price_total = price_total - OLD.price + NEW.price,
+                price_min = CASE WHEN NEW.price < price_min THEN NEW.price
+                                 WHEN OLD.price <= price_min THEN (SELECT MIN(price) FROM items)
+                                 ELSE price_min END,
+                price_max = CASE WHEN NEW.price > price_max THEN NEW.price
+                                 WHEN OLD.price >= price_max THEN (SELECT MAX(price) FROM items)
+                                 ELSE price_max END
+            WHERE id = 1;
+            UPDATE item_price_buckets SET item_count = item_count - 1
+            WHERE OLD.price >= lower_bound
+              AND (upper_bound IS NULL OR OLD.price < upper_bound);
+            UPDATE item_price_buckets SET item_count = item_count + 1
+            WHERE NEW.price >= lower_bound
+              AND (upper_bound IS NULL OR NEW.price < upper_bound);
+        END
+    """)
+
+
+def create_item_change_triggers(cursor):
+    """Create the triggers that stamp items with a sequence number and record deletions"""
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS items_seq_insert AFTER INSERT ON items
+        BEGIN
+            UPDATE item_sequence SET value = value + 1 WHERE id = 1;
+            UPDATE items SET
+                seq = (SELECT value FROM item_sequence WHERE id = 1),
+                updated_at = CURRENT_TIMESTAMP
+            WHERE id = NEW.id;
+        END
+    """)
+
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS items_seq_update AFTER UPDATE OF name, description, price ON items
+        BEGIN
+            UPDATE item_sequence SET value = value + 1 WHERE id = 1;
+            UPDATE items SET
+                seq = (SELECT value FROM item_sequence WHERE id = 1),
+                updated_at = CURRENT_TIMESTAMP
+            WHERE id = NEW.id;
+        END
+    """)
+
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS items_seq_delete AFTER DELETE ON items
+        BEGIN
+            UPDATE item_sequence SET value = value + 1 WHERE id = 1;
+            INSERT OR REPLACE INTO item_tombstones (item_id, seq, deleted_at)
+            VALUES (OLD.id, (SELECT value FROM item_sequence WHERE id = 1), CURRENT_TIMESTAMP);
+        END
+    """)
+
+
+def drop_item_indexes_and_triggers(cursor):
+    """Drop secondary indexes and triggers on items ahead of a bulk load; init_schema recreates them"""
+    cursor.execute("""
+        SELECT type, name FROM sqlite_master
+        WHERE tbl_name = 'items' AND type IN ('index', 'trigger') AND sql IS NOT NULL
+    """)
+    for object_type, name in cursor.fetchall():
+        cursor.execute(f"DROP {object_type.upper()} IF EXISTS {name}")
+
+
+def _add_column_if_missing(cursor, table, column, definition):
+    """Add a column to an existing table unless it is already there"""
+    cursor.execute(f"PRAGMA table_info({table})")
+    if column not in [row[1] for row in cursor.fetchall()]:
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+
+def connect_db():
+    """Open a connection to the app's database
+
+    DATABASE_PATH = ":memory:" gives each app one in-memory database shared
+    by all of its connections (a named "memdb" database kept alive by an
+    anchor connection) instead of a new, empty database per connection.
+    Unlike a shared-cache database it locks like a file in rollback-journal
+    mode, so a writer waits (up to the busy timeout) for readers to finish
+    instead of failing with "database table is locked". A read that stays
+    open for longer than that, such as a slow client streaming an export,
+    still makes concurrent writes fail. File databases keep their WAL file
+    at most DATABASE_JOURNAL_SIZE_LIMIT bytes once it has been reset.
+    """
+    path = current_app.config['DATABASE_PATH']
+    if path == ':memory:':
+        return sqlite3.connect(_memory_database_uri(current_app), uri=True)
+    conn = sqlite3.connect(path)
+    # Per connection: whichever connection resets the WAL truncates it
+    conn.execute(f"PRAGMA journal_size_limit = {int(current_app.config['DATABASE_JOURNAL_SIZE_LIMIT'])}")
+    return conn
+
+
+def close_memory_database(app):
+    """Release an app's in-memory database"""
+    memory_db = app.extensions.pop('memory_database', None)
+    if memory_db:
+        memory_db['anchor'].close()
+
+
+def _memory_database_uri(app):
+    memory_db = app.extensions.get('memory_database')
+    if memory_db is None:
+        with _memory_lock:
+            memory_db = app.extensions.get('memory_database')
+            if memory_db is None:
+                uri = f"file:/item-manager-{uuid.uuid4().hex}?vfs=memdb"
+                # The database lives as long as at least one connection is open
+                anchor = sqlite3.connect(uri, uri=True, check_same_thread=False)
+                memory_db = app.extensions['memory_database'] = {'uri': uri, 'anchor': anchor}
+    return memory_db['uri']
 
 
 @contextmanager
 def get_db_connection():
     """Context manager for database connections"""
-    conn = sqlite3.connect(current_app.config['DATABASE_PATH'])
+    conn = connect_db()
     conn.row_factory = sqlite3.Row  # Enable dict-like access to rows
     try:
         yield conn
@@ -0,0 +1,231 @@
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from flask import request
+from app.utils.database import connect_db
+from app.utils.metrics import register_metrics
+
+# SQLite virtual machine instructions between time-box checks
+_PROGRESS_STEPS = 1000
+
+
+@contextmanager
+def time_box(conn, seconds):
+    """Interrupt any statement run on `conn` that is still going after `seconds`
+
+    The interrupted statement is rolled back and raises
+    sqlite3.OperationalError("interrupted").
+    """
+    deadline = time.monotonic() + seconds
+    conn.set_progress_handler(lambda: time.monotonic() > deadline, _PROGRESS_STEPS)
+    try:
+        yield deadline
+    finally:
+        conn.set_progress_handler(None, 0)
+
+
+def _interrupted(error):
+    return 'interrupted' in str(error)
+
+
+def analyze(conn, seconds, analysis_limit, full=False):
+    """Refresh query planner statistics
+
+    `PRAGMA optimize` analyzes only what SQLite thinks needs it; `full`
+    additionally runs an approximate ANALYZE (at most `analysis_limit` rows
+    per index) for when many rows have changed since the last run.
+    """
+    conn.execute(f"PRAGMA analysis_limit = {int(analysis_limit)}")
+    with time_box(conn, seconds):
+        try:
+            if full:
+                conn.execute("ANALYZE")
+            conn.execute("PRAGMA optimize(0x10002)")
+            conn.commit()
+        except sqlite3.OperationalError as e:
+            if not _interrupted(e):
+                raise
+            conn.rollback()
+            return {'analyzed': full, 'timed_out': True}
+    return {'analyzed': full, 'timed_out': False}
+
+
+def checkpoint(conn, truncate=False):
+    """Copy as much of the WAL into the database as possible
+
+    A passive checkpoint never waits for a lock. With `truncate` it waits
+    (up to the connection's busy timeout) for readers to finish and then
+    cuts the WAL file to zero bytes; `busy` is set if it could not.
+    """
+    mode = 'TRUNCATE' if truncate else 'PASSIVE'
+    busy, log_frames, checkpointed = conn.execute(f"PRAGMA wal_checkpoint({mode})").fetchone()
+    return {
+        'busy': bool(busy),
+        # log_frames is -1 when the database is not in WAL mode
+        'truncated': truncate and not busy and log_frames >= 0,
+        'wal_frames': log_frames,
+        'checkpointed_frames': checkpointed
+    }
+
+
+def incremental_vacuum(conn, seconds, batch_pages):
+    """Return free pages to the file system in small batches until none are left or time runs out
+
+    Each batch is its own short write transaction, so writers waiting on the
+    lock get in between batches. Needs auto_vacuum = INCREMENTAL (see
+    init_schema); on other databases there is nothing to do.
+    """
+    if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+        return {'enabled': False, 'pages_freed': 0, 'free_pages': None, 'timed_out': False}
+
+    free_before = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    free_pages = free_before
+    timed_out = False
+    with time_box(conn, seconds) as deadline:
+        while free_pages:
+            if time.monotonic() > deadline:
+                timed_out = True
+                break
+            try:
+                conn.execute(f"PRAGMA incremental_vacuum({int(batch_pages)})").fetchall()
+                conn.commit()
+            except sqlite3.OperationalError as e:
+                if not _interrupted(e):
+                    raise
+                conn.rollback()
+                timed_out = True
+                break
+            free_pages = conn.execute("PRAGMA freelist_count").fetchone()[0]
+
+    return {
+        'enabled': True,
+        'pages_freed': free_before - free_pages,
+        'free_pages': free_pages,
+        'timed_out': timed_out
+    }
+
+
+class MaintenanceScheduler:
+    """Runs database maintenance in a background thread when the process is quiet
+
+    Every MAINTENANCE_CHECK_INTERVAL seconds the scheduler looks at how many
+    requests arrived since its last look. Once MAINTENANCE_INTERVAL has
+    passed since the previous run and traffic is at or below
+    MAINTENANCE_IDLE_MAX_REQUESTS, it refreshes planner statistics, runs a
+    WAL checkpoint that also truncates the WAL file, and an incremental
+    vacuum, each limited to MAINTENANCE_STEP_TIME_BUDGET seconds. If the
+    process never goes quiet, maintenance runs anyway once
+    MAINTENANCE_MAX_DELAY has passed, with a passive checkpoint only.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self.last_run = None
+        self.last_report = None
+        self.runs = 0
+        self.deferred = 0
+        self.failures = 0
+        self._requests = 0
+        self._analyzed_seq = None
+        self._lock = threading.Lock()
+        self._run_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        self.check_interval = app.config['MAINTENANCE_CHECK_INTERVAL']
+        self.interval = app.config['MAINTENANCE_INTERVAL']
+        self.max_delay = app.config['MAINTENANCE_MAX_DELAY']
+        self.idle_max_requests = app.config['MAINTENANCE_IDLE_MAX_REQUESTS']
+        self.step_time_budget = app.config['MAINTENANCE_STEP_TIME_BUDGET']
+        self.analysis_limit = app.config['MAINTENANCE_ANALYSIS_LIMIT']
+        self.analyze_min_changes = app.config['MAINTENANCE_ANALYZE_MIN_CHANGES']
+        self.vacuum_batch_pages = app.config['MAINTENANCE_VACUUM_BATCH_PAGES']
+        self._scheduled_since = time.monotonic()
+
+        app.before_request(self._count_request)
+        app.extensions['maintenance'] = self
+        register_metrics(app, 'maintenance', self.stats)
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name='db-maintenance', daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def tick(self, now=None):
+        """Run maintenance if it is due and traffic allows; returns the report or None"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            requests, self._requests = self._requests, 0
+        since = now - (self.last_run if self.last_run is not None else self._scheduled_since)
+        if since < self.interval:
+            return None
+        idle = requests <= self.idle_max_requests
+        if not idle and since < self.max_delay:
+            self.deferred += 1
+            return None
+        with self.app.app_context():
+            return self.run(truncate_wal=idle)
+
+    def run(self, truncate_wal=False):
+        """Run every maintenance step now (inside an app context)"""
+        with self._run_lock:
+            started = time.perf_counter()
+            conn = connect_db()
+            try:
+                # Give up quickly rather than queue behind request writes
+                conn.execute(f"PRAGMA busy_timeout = {int(self.step_time_budget * 1000)}")
+                report = self._run_steps(conn, truncate_wal)
+            except sqlite3.Error as e:
+                self.failures += 1
+                self.app.logger.warning("Database maintenance failed: %s", e)
+                report = {'error': str(e)}
+            finally:
+                conn.close()
+            report['seconds'] = round(time.perf_counter() - started, 3)
+            self.last_run = time.monotonic()
+            self.last_report = report
+            self.runs += 1
+            return report
+
+    def stats(self):
+        return {
+            'runs': self.runs,
+            'deferred': self.deferred,
+            'failures': self.failures,
+            'seconds_since_last_run': round(time.monotonic() - self.last_run, 1) if self.last_run is not None else None,
+            'last_report': self.last_report
+        }
+
+    def _run_steps(self, conn, truncate_wal):
+        seq = conn.execute("SELECT value FROM item_sequence WHERE id = 1").fetchone()
+        seq = seq[0] if seq else 0
+        full = self._analyzed_seq is None or seq - self._analyzed_seq >= self.analyze_min_changes
+
+        report = {'analyze': analyze(conn, self.step_time_budget, self.analysis_limit, full)}
+        if full and not report['analyze']['timed_out']:
+            self._analyzed_seq = seq
+        report['checkpoint'] = checkpoint(conn, truncate_wal)
+        report['incremental_vacuum'] = incremental_vacuum(conn, self.step_time_budget, self.vacuum_batch_pages)
+        return report
+
+    def _count_request(self):
+        if request.endpoint != 'static':
+            with self._lock:
+                self._requests += 1
+
+    def _loop(self):
+        while not self._stop.wait(self.check_interval):
+            try:
+                self.tick()
+            except Exception:
+                self.app.logger.exception("Database maintenance tick failed")
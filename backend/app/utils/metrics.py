@@ -0,0 +1,22 @@
+import hmac
+from flask import current_app, request
+
+
+def register_metrics(app, name, provider):
+    """Expose the dictionary returned by `provider()` under `name` in /metrics"""
+    app.extensions.setdefault('metrics', {})[name] = provider
+
+
+def collect_metrics():
+    """Collect the current values of every registered metrics provider"""
+    providers = current_app.extensions.get('metrics', {})
+    return {name: provider() for name, provider in providers.items()}
+
+
+def has_metrics_token():
+    """Whether the request's bearer token is METRICS_TOKEN, for scrapers that cannot log in"""
+    expected = current_app.config.get('METRICS_TOKEN')
+    if not expected:
+        return False
+    supplied = request.headers.get('Authorization', '')
+    return hmac.compare_digest(supplied.encode(), f"Bearer {expected}".encode())
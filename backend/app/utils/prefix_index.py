@@ -0,0 +1,223 @@
+import logging
+import threading
+import time
+from bisect import bisect_left, insort
+
+
+def index_keys(name):
+    """Lowercased keys an item name is found under: the whole name and every word-start suffix"""
+    lowered = name.lower()
+    keys = [lowered]
+    for position, char in enumerate(lowered):
+        if position and char != ' ' and lowered[position - 1] == ' ':
+            keys.append(lowered[position:])
+    return keys
+
+
+logger = logging.getLogger(__name__)
+
+
+class PrefixIndex:
+    """Sorted array of (key, item id) pairs answering prefix queries with bisect
+
+    The index remembers the item sequence number (see item_sequence) it is
+    current as of. Writes made through this process are applied in place
+    when they are the very next change; anything else (other workers, bulk
+    loads, raw SQL, local writes applied out of order) is noticed by
+    comparing sequence numbers at most every `check_interval` seconds and
+    caught up from the change log via `changes_loader`. Only when that is
+    unavailable or reports too many changes is the index rebuilt, in a
+    background thread; queries keep being answered from the current arrays
+    until the new ones are swapped in. Only the very first build runs in the
+    caller's thread.
+    """
+
+    def __init__(self, loader, seq_reader, check_interval=1.0, changes_loader=None):
+        # loader() -> (seq, [(id, name), ...]) read in one transaction
+        self._loader = loader
+        self._seq_reader = seq_reader
+        # changes_loader(since) -> (seq, [(id, name), ...], [deleted id, ...])
+        # for every change after `since`, or None when there are too many
+        self._changes_loader = changes_loader
+        self.check_interval = check_interval
+        # Guards the arrays; never held while loading from the database
+        self._lock = threading.Lock()
+        # Held for the whole of a build or catch-up, so only one runs at a time
+        self._build_lock = threading.Lock()
+        self._entries = []
+        self._names = {}
+        self.seq = None
+        # Set when a local write could not be applied, forcing the next check
+        self._behind = False
+        self._last_check = 0.0
+        self.builds = 0
+        self.catch_ups = 0
+        self.incremental_updates = 0
+        self.lookups = 0
+
+    def build(self):
+        with self._build_lock:
+            self._build()
+
+    def _build(self):
+        seq, rows = self._loader()
+        entries = []
+        names = {}
+        for item_id, name in rows:
+            names[item_id] = name
+            entries.extend((key, item_id) for key in index_keys(name))
+        entries.sort()
+        with self._lock:
+            self._last_check = time.monotonic()
+            # Local writes applied while loading made the current arrays newer
+            if self.seq is not None and seq < self.seq:
+                return
+            self._entries, self._names, self.seq = entries, names, seq
+            self._behind = False
+            self.builds += 1
+
+    def _build_in_background(self):
+        try:
+            self._build()
+        except Exception:
+            logger.exception("Rebuilding the suggest index failed")
+        finally:
+            self._build_lock.release()
+
+    def search(self, prefix, limit=10):
+        """Return up to `limit` (id, name) pairs whose name or any word in it starts with `prefix`"""
+        prefix = prefix.lower().strip()
+        if not prefix:
+            return []
+        self._ensure_fresh()
+
+        with self._lock:
+            self.lookups += 1
+            entries, names = self._entries, self._names
+            results = []
+            seen = set()
+            position = bisect_left(entries, (prefix,))
+            while position < len(entries) and len(results) < limit:
+                key, item_id = entries[position]
+                if not key.startswith(prefix):
+                    break
+                if item_id not in seen:
+                    seen.add(item_id)
+                    results.append((item_id, names[item_id]))
+                position += 1
+            return results
+
+    def apply_upsert(self, item_id, name, seq):
+        """Apply a local create or update made at sequence number `seq`"""
+        with self._lock:
+            if not self._is_next(seq):
+                return
+            self._upsert(item_id, name)
+            self.seq = seq
+            self.incremental_updates += 1
+
+    def apply_delete(self, item_id, seq):
+        """Apply a local delete made at sequence number `seq`"""
+        with self._lock:
+            if not self._is_next(seq):
+                return
+            self._delete(item_id)
+            self.seq = seq
+            self.incremental_updates += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                'items': len(self._names),
+                'keys': len(self._entries),
+                'seq': self.seq,
+                'builds': self.builds,
+                'catch_ups': self.catch_ups,
+                'incremental_updates': self.incremental_updates,
+                'lookups': self.lookups,
+                'rebuilding': self._build_lock.locked()
+            }
+
+    def _is_next(self, seq):
+        # Out of order or after unseen changes: leave it to the next catch-up
+        if self.seq is None or seq != self.seq + 1:
+            if self.seq is not None and seq > self.seq:
+                self._behind = True
+            return False
+        return True
+
+    def _upsert(self, item_id, name):
+        old_name = self._names.get(item_id)
+        if old_name != name:
+            if old_name is not None:
+                self._remove(item_id, old_name)
+            self._names[item_id] = name
+            for key in index_keys(name):
+                insort(self._entries, (key, item_id))
+
+    def _delete(self, item_id):
+        old_name = self._names.pop(item_id, None)
+        if old_name is not None:
+            self._remove(item_id, old_name)
+
+    def _remove(self, item_id, name):
+        for key in index_keys(name):
+            position = bisect_left(self._entries, (key, item_id))
+            if position < len(self._entries) and self._entries[position] == (key, item_id):
+                del self._entries[position]
+
+    def _catch_up(self, since):
+        """Apply every change after `since` from the change log; False if a rebuild is needed"""
+        if self._changes_loader is None:
+            return False
+        changes = self._changes_loader(since)
+        if changes is None:
+            return False
+        seq, rows, deleted = changes
+        with self._lock:
+            self._last_check = time.monotonic()
+            # A rebuild or local writes got further while this was loading
+            if self.seq is None or seq < self.seq:
+                return True
+            # Rows are read as they are now, so apply deletes first: an id
+            # deleted and then reused has its new row among `rows`
+            for item_id in deleted:
+                self._delete(item_id)
+            for item_id, name in rows:
+                self._upsert(item_id, name)
+            self.seq = seq
+            self._behind = False
+            self.catch_ups += 1
+        return True
+
+    def _ensure_fresh(self):
+        with self._lock:
+            seq, behind = self.seq, self._behind
+            if seq is not None and not behind:
+                now = time.monotonic()
+                if now - self._last_check < self.check_interval:
+                    return
+                self._last_check = now
+
+        if seq is None:
+            # Nothing to serve yet: build now (once, however many callers wait)
+            with self._build_lock:
+                if self.seq is None:
+                    self._build()
+            return
+
+        if not behind and self._seq_reader() == seq:
+            return
+        # Someone else is already catching up or rebuilding: serve what we have
+        if not self._build_lock.acquire(blocking=False):
+            return
+        try:
+            caught_up = self._catch_up(seq)
+        except Exception:
+            logger.exception("Catching the suggest index up failed")
+            caught_up = False
+        if caught_up:
+            self._build_lock.release()
+        else:
+            # The background thread releases the lock when it is done
+            threading.Thread(target=self._build_in_background, name='suggest-index-build', daemon=True).start()
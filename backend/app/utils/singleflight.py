@@ -0,0 +1,93 @@
+import threading
+from collections import OrderedDict
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key into one execution
+
+    The first caller for a key runs the function; callers arriving while it
+    is still running wait and receive the same result (or exception). Nothing
+    is cached once the call finishes. Writers call `forget()` for the keys
+    they affect once committed, so a caller arriving after a write never
+    joins a call that started before it.
+    """
+
+    def __init__(self, max_tracked_keys=1024):
+        self.max_tracked_keys = max_tracked_keys
+        self._lock = threading.Lock()
+        self._inflight = {}
+        # Per-key counters, least recently used keys dropped first
+        self._key_stats = OrderedDict()
+        self.calls = 0
+        self.executions = 0
+        self.coalesced = 0
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._inflight.get(key)
+            leader = call is None
+            if leader:
+                call = self._inflight[key] = _Call()
+            self._count(key, leader)
+
+        if not leader:
+            call.done.wait()
+        else:
+            try:
+                call.result = fn()
+            except Exception as e:
+                call.error = e
+            finally:
+                with self._lock:
+                    # A forgotten call may already have been replaced by a newer one
+                    if self._inflight.get(key) is call:
+                        del self._inflight[key]
+                call.done.set()
+
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def forget(self, match):
+        """Make callers of in-flight keys for which `match(key)` is true start a new call
+
+        Callers already waiting still receive the result of the call they joined.
+        """
+        with self._lock:
+            for key in [key for key in self._inflight if match(key)]:
+                del self._inflight[key]
+
+    def stats(self, top=20):
+        with self._lock:
+            busiest = sorted(self._key_stats.items(), key=lambda item: item[1]['coalesced'], reverse=True)
+            return {
+                'calls': self.calls,
+                'executions': self.executions,
+                'coalesced': self.coalesced,
+                'in_flight': len(self._inflight),
+                'keys': {repr(key): dict(counts) for key, counts in busiest[:top]}
+            }
+
+    def _count(self, key, leader):
+        self.calls += 1
+        counts = self._key_stats.get(key)
+        if counts is None:
+            counts = self._key_stats[key] = {'calls': 0, 'executions': 0, 'coalesced': 0}
+            if len(self._key_stats) > self.max_tracked_keys:
+                self._key_stats.popitem(last=False)
+        else:
+            self._key_stats.move_to_end(key)
+        counts['calls'] += 1
+        if leader:
+            self.executions += 1
+            counts['executions'] += 1
+        else:
+            self.coalesced += 1
+            counts['coalesced'] += 1
@@ -0,0 +1,107 @@
+import importlib
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+
+class StartupProfile:
+    """Wall-clock timings of the phases of an app boot, in milliseconds"""
+
+    def __init__(self, started=None):
+        self.started = started if started is not None else time.perf_counter()
+        self.phases = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, started)
+
+    def import_module(self, name):
+        """Import module `name`, recording the time as import:<name> if this call loaded it
+
+        The time includes any modules it is the first to import.
+        """
+        if name in sys.modules:
+            return sys.modules[name]
+        started = time.perf_counter()
+        module = importlib.import_module(name)
+        self.record(f'import:{name}', started)
+        return module
+
+    def record(self, name, started, finished=None):
+        elapsed = ((finished or time.perf_counter()) - started) * 1000
+        with self._lock:
+            self.phases[name] = round(elapsed, 2)
+
+    def report(self):
+        with self._lock:
+            return {
+                'phases_ms': dict(self.phases),
+                'since_start_ms': round((time.perf_counter() - self.started) * 1000, 2)
+            }
+
+
+class Warmup:
+    """Runs registered warmup tasks, optionally in a background thread, and tracks readiness
+
+    Tasks are ``task()`` callables run inside an app context. The app is
+    ready once every task has finished; a failing task is logged and
+    reported but does not block readiness forever.
+    """
+
+    def __init__(self, app, profile):
+        self.app = app
+        self.profile = profile
+        self.tasks = []
+        self.completed = []
+        self.failed = {}
+        self._done = threading.Event()
+        self._started = False
+
+    def register(self, name, task):
+        self.tasks.append((name, task))
+
+    def start(self, background=True):
+        if self._started:
+            return
+        self._started = True
+        if background:
+            threading.Thread(target=self._run, name='warmup', daemon=True).start()
+        else:
+            self._run()
+
+    def is_ready(self):
+        return self._done.is_set()
+
+    def wait(self, timeout=None):
+        return self._done.wait(timeout)
+
+    def status(self):
+        finished = set(self.completed) | set(self.failed)
+        return {
+            'ready': self.is_ready(),
+            'completed': list(self.completed),
+            'pending': [name for name, _ in self.tasks if name not in finished],
+            'failed': dict(self.failed)
+        }
+
+    def _run(self):
+        started = time.perf_counter()
+        with self.app.app_context():
+            for name, task in self.tasks:
+                try:
+                    with self.profile.phase(f'warmup:{name}'):
+                        task()
+                    self.completed.append(name)
+                except Exception as e:
+                    self.app.logger.exception("Warmup task %s failed", name)
+                    self.failed[name] = str(e) or e.__class__.__name__
+        self.profile.record('warmup', started)
+        self._done.set()
+        self.app.logger.info("Startup profile: %s", self.profile.report())
+
@@ -0,0 +1,86 @@
+def bucket_ranges(boundaries):
+    """Turn sorted bucket boundaries into (lower, upper) pairs, the last one open-ended"""
+    boundaries = sorted(boundaries)
+    uppers = boundaries[1:] + [None]
+    return list(zip(boundaries, uppers))
+
+
+def recompute_item_stats(conn, price_buckets):
+    """Rebuild item_stats and item_price_buckets from a full scan of items"""
+    cursor = conn.cursor()
+
+    cursor.execute("DELETE FROM item_stats")
+    cursor.execute("""
+        INSERT INTO item_stats (id, item_count, price_total, price_min, price_max)
+        SELECT 1, COUNT(*), COALESCE(SUM(price), 0), MIN(price), MAX(price) FROM items
+    """)
+
+    cursor.execute("DELETE FROM item_price_buckets")
+    for lower, upper in bucket_ranges(price_buckets):
+        cursor.execute("""
+            INSERT INTO item_price_buckets (lower_bound, upper_bound, item_count)
+            SELECT ?, ?, COUNT(*) FROM items
+            WHERE price >= ? AND (? IS NULL OR price < ?)
+        """, (lower, upper, lower, upper, upper))
+
+    conn.commit()
+
+
+def read_item_stats(conn):
+    """Read the precomputed item statistics as a dictionary"""
+    cursor = conn.cursor()
+    cursor.execute("SELECT item_count, price_total, price_min, price_max FROM item_stats WHERE id = 1")
+    row = cursor.fetchone()
+    count, total, price_min, price_max = row if row else (0, 0, None, None)
+
+    cursor.execute("SELECT lower_bound, upper_bound, item_count FROM item_price_buckets ORDER BY lower_bound")
+    histogram = [
+        {'min': lower, 'max': upper, 'count': bucket_count}
+        for lower, upper, bucket_count in cursor.fetchall()
+    ]
+
+    return {
+        'count': count,
+        'price': {
+            'total': round(total, 2),
+            'min': price_min,
+            'max': price_max,
+            'average': round(total / count, 2) if count else None
+        },
+        'histogram': histogram
+    }
+
+
+def validate_item_stats(conn, price_buckets, tolerance=0.005):
+    """Compare the maintained summary against a full scan and return a list of mismatches"""
+    stored = read_item_stats(conn)
+    cursor = conn.cursor()
+    errors = []
+
+    cursor.execute("SELECT COUNT(*), COALESCE(SUM(price), 0), MIN(price), MAX(price) FROM items")
+    count, total, price_min, price_max = cursor.fetchone()
+
+    if stored['count'] != count:
+        errors.append(f"count is {stored['count']}, expected {count}")
+    if abs(stored['price']['total'] - round(total, 2)) > tolerance:
+        errors.append(f"price total is {stored['price']['total']}, expected {round(total, 2)}")
+    if stored['price']['min'] != price_min:
+        errors.append(f"price min is {stored['price']['min']}, expected {price_min}")
+    if stored['price']['max'] != price_max:
+        errors.append(f"price max is {stored['price']['max']}, expected {price_max}")
+
+    expected_ranges = bucket_ranges(price_buckets)
+    stored_ranges = [(bucket['min'], bucket['max']) for bucket in stored['histogram']]
+    if stored_ranges != expected_ranges:
+        errors.append("histogram buckets do not match the configured ITEM_PRICE_BUCKETS")
+    else:
+        for bucket in stored['histogram']:
+            cursor.execute(
+                "SELECT COUNT(*) FROM items WHERE price >= ? AND (? IS NULL OR price < ?)",
+                (bucket['min'], bucket['max'], bucket['max'])
+            )
+            expected = cursor.fetchone()[0]
+            if bucket['count'] != expected:
+                errors.append(f"bucket {bucket['min']}-{bucket['max']} count is {bucket['count']}, expected {expected}")
+
+    return errors
@@ -1,3 +1,6 @@
+import math
+
+
 def validate_item_data(data, is_update=False):
     """Validate item data and return errors if any"""
     errors = []
@@ -13,7 +16,10 @@ def validate_item_data(data, is_update=False):
     if 'price' in data:
         try:
             price = float(data['price'])
-            if price <= 0:
+            # NaN fails every comparison and infinity is not valid JSON
+            if not math.isfinite(price):
+                errors.append("Price must be a finite number")
+            elif price <= 0:
                 errors.append("Price must be a positive number")
         except (ValueError, TypeError):
             errors.append("Price must be a valid number")
@@ -23,6 +29,24 @@ def validate_item_data(data, is_update=False):
     return errors
 
 
+def parse_fields(value, allowed, required=('id',)):
+    """Parse a comma-separated ?fields= value against a whitelist and return (fields, errors)"""
+    if value is None:
+        return None, []
+    
+    requested = [field.strip() for field in value.split(',') if field.strip()]
+    if not requested:
+        return None, ["fields must name at least one field"]
+    
+    unknown = [field for field in requested if field not in allowed]
+    if unknown:
+        return None, [f"Unknown field(s): {', '.join(unknown)}. Allowed: {', '.join(allowed)}"]
+    
+    # Always include required fields, keep the whitelist's column order
+    wanted = set(requested) | set(required)
+    return [field for field in allowed if field in wanted], []
+
+
 def validate_user_data(data, is_login=False):
     """Validate user registration/login data and return errors if any"""
     errors = []
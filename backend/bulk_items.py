@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Bulk import items from, or export items to, a CSV or NDJSON file
+"""
+
+import argparse
+import sqlite3
+import sys
+
+from app.config import Config
+from app.utils.bulk import detect_format, export_items, import_items, read_rows
+
+DATABASE_PATH = "items.db"
+
+
+def run_import(conn, path, fmt, chunk_size):
+    with open(path, encoding='utf-8', newline='') as source:
+        report = import_items(
+            conn,
+            read_rows(source, fmt),
+            chunk_size=chunk_size,
+            max_reported=Config.ITEM_IMPORT_MAX_REJECTED_REPORTED
+        )
+
+    print(f"✅ Imported {report['imported']} items in {report['seconds']}s "
+          f"({report['rows_per_second']} rows/s)")
+    if report['rejected_count']:
+        print(f"❌ Rejected {report['rejected_count']} rows:")
+        for rejected in report['rejected']:
+            print(f"  line {rejected['line']}: {'; '.join(rejected['errors'])}")
+        if report['rejected_count'] > len(report['rejected']):
+            print(f"  ... and {report['rejected_count'] - len(report['rejected'])} more")
+    if 'aborted' in report:
+        aborted = report['aborted']
+        print(f"❌ Stopped after line {aborted['after_line']}: {aborted['error']} "
+              f"(the {report['imported']} items above were committed)")
+    return 1 if report['rejected_count'] or 'aborted' in report else 0
+
+
+def run_export(conn, path, fmt, batch_size):
+    report = {}
+    with open(path, 'w', encoding='utf-8', newline='') as target:
+        for chunk in export_items(conn, fmt, batch_size=batch_size, report=report):
+            target.write(chunk)
+
+    print(f"✅ Exported {report['exported']} items in {report['seconds']}s "
+          f"({report['rows_per_second']} rows/s)")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('command', choices=['import', 'export'])
+    parser.add_argument('path', help="CSV (.csv) or NDJSON (.ndjson/.jsonl) file")
+    parser.add_argument('--format', choices=['csv', 'ndjson'], help="Override the format implied by the file name")
+    parser.add_argument('--database', default=DATABASE_PATH, help="SQLite database file")
+    parser.add_argument('--chunk-size', type=int, default=Config.ITEM_IMPORT_CHUNK_SIZE,
+                        help="Rows per transaction (import) or per fetch (export)")
+    args = parser.parse_args()
+
+    fmt = detect_format(args.format, filename=args.path)
+    if not fmt:
+        parser.error("cannot tell the format from the file name, pass --format")
+
+    conn = sqlite3.connect(args.database)
+    try:
+        if args.command == 'import':
+            return run_import(conn, args.path, fmt, args.chunk_size)
+        return run_export(conn, args.path, fmt, args.chunk_size)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
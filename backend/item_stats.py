@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Recompute or validate the precomputed item statistics behind /api/items/stats
+"""
+
+import argparse
+import sqlite3
+import sys
+
+from app.config import Config
+from app.utils.stats import recompute_item_stats, validate_item_stats
+
+DATABASE_PATH = "items.db"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('command', choices=['recompute', 'validate'])
+    parser.add_argument('--database', default=DATABASE_PATH, help="SQLite database file")
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(args.database)
+    try:
+        if args.command == 'recompute':
+            recompute_item_stats(conn, Config.ITEM_PRICE_BUCKETS)
+            print("✅ Item statistics recomputed")
+            return 0
+
+        errors = validate_item_stats(conn, Config.ITEM_PRICE_BUCKETS)
+        if errors:
+            print("❌ Item statistics are out of date:")
+            for error in errors:
+                print(f"  - {error}")
+            print("\nRun `python item_stats.py recompute` to rebuild them.")
+            return 1
+
+        print("✅ Item statistics match the items table")
+        return 0
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,17 +1,58 @@
 #!/usr/bin/env python3
 """
-Seed the database with sample users and items for testing authentication
+Seed the database with sample users and items for testing authentication,
+or generate a large synthetic dataset for load testing and profiling
 """
 
+import argparse
+import itertools
+import random
 import sqlite3
+import sys
+import time
 from werkzeug.security import generate_password_hash
 
+from app.config import Config
+from app.utils.database import drop_item_indexes_and_triggers, init_schema
+from app.utils.stats import recompute_item_stats
+
 DATABASE_PATH = "items.db"
 
+ADJECTIVES = [
+    'Compact', 'Deluxe', 'Ergonomic', 'Portable', 'Premium', 'Rugged', 'Smart',
+    'Vintage', 'Wireless', 'Modern', 'Classic', 'Lightweight', 'Heavy-Duty', 'Eco'
+]
+MATERIALS = [
+    'Aluminum', 'Bamboo', 'Ceramic', 'Cotton', 'Glass', 'Leather', 'Oak',
+    'Steel', 'Silicone', 'Wool', 'Carbon', 'Marble'
+]
+NOUNS = [
+    'Backpack', 'Blender', 'Chair', 'Desk Lamp', 'Headphones', 'Keyboard', 'Kettle',
+    'Laptop Stand', 'Monitor', 'Mug', 'Notebook', 'Plant Pot', 'Speaker', 'Watch',
+    'Water Bottle', 'Yoga Mat', 'Camera', 'Charger', 'Router'
+]
+DESCRIPTION_WORDS = [
+    'adjustable', 'brightness', 'comfortable', 'design', 'durable', 'everyday',
+    'finish', 'grip', 'high-quality', 'home', 'indoor', 'long-lasting', 'office',
+    'outdoor', 'performance', 'quiet', 'reliable', 'sleek', 'travel', 'warranty'
+]
+FIRST_NAMES = ['Alex', 'Sam', 'Jordan', 'Taylor', 'Morgan', 'Casey', 'Riley', 'Jamie', 'Avery', 'Quinn']
+LAST_NAMES = ['Smith', 'Garcia', 'Chen', 'Patel', 'Kim', 'Nguyen', 'Brown', 'Silva', 'Okafor', 'Novak']
+
+# PRAGMAs for a one-off bulk load: durability is traded for speed and
+# restored afterwards
+LOAD_PRAGMAS = {
+    'synchronous': 'OFF',
+    'journal_mode': 'MEMORY',
+    'temp_store': 'MEMORY',
+    'cache_size': '-262144',
+    'locking_mode': 'EXCLUSIVE',
+}
+
 
-def seed_auth_data():
-    """Add sample users and items to the database"""
-    conn = sqlite3.connect(DATABASE_PATH)
+def seed_auth_data(database=DATABASE_PATH):
+    """Add sample users and items to the database; returns whether it succeeded"""
+    conn = sqlite3.connect(database)
     cursor = conn.cursor()
 
     try:
@@ -101,13 +142,181 @@ def seed_auth_data():
         print("👤 Email: john@example.com | Password: password123")
         print("👤 Email: jane@example.com | Password: password123")
         print("\nYou can now test authentication with these accounts!")
+        return True
 
     except Exception as e:
         print(f"❌ Error seeding database: {e}")
         conn.rollback()
+        return False
     finally:
         conn.close()
 
 
+def generate_price(rng, distribution, price_min, price_max):
+    """Draw one price from the configured distribution, clamped and rounded to cents"""
+    if distribution == 'uniform':
+        price = rng.uniform(price_min, price_max)
+    elif distribution == 'pareto':
+        price = price_min * rng.paretovariate(1.5)
+    else:
+        # Median around $40 with a long tail, like most retail catalogues
+        price = rng.lognormvariate(3.7, 1.0)
+    return round(min(max(price, price_min), price_max), 2)
+
+
+def generate_items(rng, count, distribution, price_min, price_max, description_words, first_seq, updated_at):
+    """Yield item rows (name, description, price, seq, updated_at)"""
+    for offset in range(count):
+        name = f"{rng.choice(ADJECTIVES)} {rng.choice(MATERIALS)} {rng.choice(NOUNS)}"
+        if rng.random() < 0.5:
+            name += f" {rng.choice('ABCDEFGHJKLMNPRSTXZ')}{rng.randint(10, 9999)}"
+
+        words = max(0, int(rng.gauss(description_words, description_words / 3))) if description_words else 0
+        description = ' '.join(rng.choice(DESCRIPTION_WORDS) for _ in range(words)).capitalize()
+
+        price = generate_price(rng, distribution, price_min, price_max)
+        yield name, description, price, first_seq + offset, updated_at
+
+
+def generate_users(rng, count, password_hash, start):
+    """Yield user rows (email, password_hash, name); every user shares one password"""
+    for n in range(start, start + count):
+        name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+        yield f"user{n}@example.com", password_hash, name
+
+
+def generate_dataset(database, items, users, seed, distribution, price_min, price_max,
+                     description_words, password, batch_size, append):
+    """Bulk load a deterministic synthetic dataset for load testing; returns whether it succeeded"""
+    # Separate generators so the items do not depend on the number of users
+    item_rng = random.Random(f"items-{seed}")
+    user_rng = random.Random(f"users-{seed}")
+    conn = sqlite3.connect(database)
+    cursor = conn.cursor()
+    started = time.perf_counter()
+    created_users = 0
+
+    cursor.execute("PRAGMA journal_mode")
+    previous_journal_mode = cursor.fetchone()[0]
+
+    try:
+        init_schema(conn, Config.ITEM_PRICE_BUCKETS)
+
+        for pragma, value in LOAD_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {pragma} = {value}")
+
+        # Indexes and triggers are rebuilt once at the end instead of
+        # being maintained row by row
+        drop_item_indexes_and_triggers(cursor)
+
+        if not append:
+            # Record the wipe in the change feed with a single sequence number
+            cursor.execute("UPDATE item_sequence SET value = value + 1 WHERE id = 1")
+            cursor.execute("""
+                INSERT OR REPLACE INTO item_tombstones (item_id, seq)
+                SELECT id, (SELECT value FROM item_sequence WHERE id = 1) FROM items
+            """)
+            cursor.execute("DELETE FROM items")
+            print("Cleared existing items")
+        conn.commit()
+
+        if users:
+            # Hashing is deliberately slow, so do it once for every user
+            password_hash = generate_password_hash(password)
+            cursor.execute("SELECT COALESCE(MAX(id), 0) FROM users")
+            first_user = cursor.fetchone()[0] + 1
+            cursor.executemany(
+                "INSERT OR IGNORE INTO users (email, password_hash, name) VALUES (?, ?, ?)",
+                generate_users(user_rng, users, password_hash, first_user)
+            )
+            # Emails that are already taken are skipped, not counted
+            created_users = cursor.rowcount
+            conn.commit()
+            print(f"Created {created_users} users (user{first_user}@example.com onwards, password: {password})")
+            if created_users < users:
+                print(f"Skipped {users - created_users} users whose email already exists")
+
+        cursor.execute("SELECT value FROM item_sequence WHERE id = 1")
+        first_seq = cursor.fetchone()[0] + 1
+        cursor.execute("SELECT CURRENT_TIMESTAMP")
+        updated_at = cursor.fetchone()[0]
+        rows = generate_items(item_rng, items, distribution, price_min, price_max,
+                              description_words, first_seq, updated_at)
+
+        inserted = 0
+        while True:
+            batch = list(itertools.islice(rows, batch_size))
+            if not batch:
+                break
+            cursor.executemany(
+                "INSERT INTO items (name, description, price, seq, updated_at) VALUES (?, ?, ?, ?, ?)",
+                batch
+            )
+            inserted += len(batch)
+            cursor.execute("UPDATE item_sequence SET value = ? WHERE id = 1", (first_seq + inserted - 1,))
+            conn.commit()
+            elapsed = time.perf_counter() - started
+            print(f"  {inserted}/{items} items ({inserted / elapsed:.0f} rows/s)")
+
+        cursor.execute("ANALYZE")
+        conn.commit()
+
+        elapsed = time.perf_counter() - started
+        print(f"\n✅ Generated {inserted} items and {created_users} users in {elapsed:.1f}s")
+        return True
+
+    except Exception as e:
+        print(f"❌ Error generating data: {e}")
+        conn.rollback()
+        return False
+    finally:
+        # Also after a failed load: batches already committed must not be
+        # left without triggers or with a stale statistics summary
+        print("Rebuilding indexes, triggers and statistics...")
+        init_schema(conn, Config.ITEM_PRICE_BUCKETS)
+        recompute_item_stats(conn, Config.ITEM_PRICE_BUCKETS)
+        conn.commit()
+        cursor.execute("PRAGMA synchronous = FULL")
+        cursor.execute("PRAGMA locking_mode = NORMAL")
+        cursor.execute(f"PRAGMA journal_mode = {previous_journal_mode}")
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--database', default=DATABASE_PATH, help="SQLite database file")
+    parser.add_argument('--items', type=int, help="Generate this many synthetic items instead of the sample data")
+    parser.add_argument('--users', type=int, default=0, help="Synthetic users to generate")
+    parser.add_argument('--seed', type=int, default=42, help="Random seed; the same seed gives the same data")
+    parser.add_argument('--price-distribution', choices=['lognormal', 'uniform', 'pareto'], default='lognormal')
+    parser.add_argument('--price-min', type=float, default=0.99)
+    parser.add_argument('--price-max', type=float, default=5000.0)
+    parser.add_argument('--description-words', type=int, default=12, help="Mean description length in words")
+    parser.add_argument('--password', default='password123', help="Password shared by generated users")
+    parser.add_argument('--batch-size', type=int, default=50000, help="Rows per INSERT transaction")
+    parser.add_argument('--append', action='store_true',
+                        help="Keep existing items instead of clearing them (always the case without --items)")
+    args = parser.parse_args()
+
+    if args.items is None and not args.users:
+        return 0 if seed_auth_data(args.database) else 1
+
+    succeeded = generate_dataset(
+        database=args.database,
+        items=args.items or 0,
+        users=args.users,
+        seed=args.seed,
+        distribution=args.price_distribution,
+        price_min=args.price_min,
+        price_max=args.price_max,
+        description_words=args.description_words,
+        password=args.password,
+        batch_size=args.batch_size,
+        # Generating only users must not wipe the items
+        append=args.append or args.items is None,
+    )
+    return 0 if succeeded else 1
+
+
 if __name__ == "__main__":
-    seed_auth_data()
+    sys.exit(main())
@@ -1,30 +1,25 @@
 import pytest
-import tempfile
-import os
 from app import create_app
-from app.utils.database import init_db
+from app.utils.database import close_memory_database, init_db
 
 
 @pytest.fixture
 def app():
     """Create and configure a new app instance for each test."""
-    # Create a temporary file for test database
-    db_fd, db_path = tempfile.mkstemp()
-    
-    # Create app with testing configuration
+    # Create app with testing configuration (in-memory database)
     app = create_app('testing')
-    app.config['DATABASE_PATH'] = db_path
     app.config['TESTING'] = True
     
-    # Initialize database within app context
+    # Initialize database within app context; cloned from a template
+    # built once per test session
     with app.app_context():
         init_db()
     
     yield app
     
     # Clean up
-    os.close(db_fd)
-    os.unlink(db_path)
+    app.extensions['job_manager'].shutdown()
+    close_memory_database(app)
 
 
 @pytest.fixture
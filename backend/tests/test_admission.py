@@ -0,0 +1,63 @@
+import threading
+import time
+from app.utils.admission import ConcurrencyLimiter
+
+
+def test_limiter_queues_then_sheds():
+    """Test that a full limiter queues up to max_queue and rejects the rest."""
+    limiter = ConcurrencyLimiter('test', limit=1, max_queue=1, queue_timeout=5)
+    assert limiter.acquire()
+
+    queued = []
+    waiter = threading.Thread(target=lambda: queued.append(limiter.acquire()))
+    waiter.start()
+    while limiter.stats()['waiting'] == 0:
+        time.sleep(0.001)
+
+    # Queue is full: shed immediately
+    assert limiter.acquire() is False
+
+    limiter.release()
+    waiter.join(2)
+    assert queued == [True]
+    stats = limiter.stats()
+    assert stats['active'] == 1 and stats['rejected'] == 1 and stats['admitted'] == 2
+
+
+def test_limiter_queue_timeout():
+    """Test that a queued request gives up after queue_timeout."""
+    limiter = ConcurrencyLimiter('test', limit=1, max_queue=1, queue_timeout=0.05)
+    assert limiter.acquire()
+    assert limiter.acquire() is False
+    assert limiter.stats()['timed_out'] == 1
+
+
+def test_saturated_route_class_returns_503(app, client, auth_token):
+    """Test that requests to a saturated route class are shed with Retry-After."""
+    headers = {'Authorization': f'Bearer {auth_token}'}
+    limiter = app.extensions['admission_control'].limiters['items_read']
+    limiter.limit, limiter.max_queue = 1, 0
+    assert limiter.acquire()
+
+    response = client.get('/api/items', headers=headers)
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '1'
+
+    # Other classes are unaffected, and the slot is released after each request
+    assert client.post('/api/items', json={'name': 'Write', 'price': 1}, headers=headers).status_code == 201
+    limiter.release()
+    assert client.get('/api/items', headers=headers).status_code == 200
+    assert client.get('/metrics', headers=headers).get_json()['admission']['items_read']['active'] == 0
+
+
+def test_only_password_hashing_counts_as_auth(app, client, auth_token):
+    """Test that login and register use the auth class while cheap auth endpoints are items_read."""
+    headers = {'Authorization': f'Bearer {auth_token}'}
+    limiter = app.extensions['admission_control'].limiters['auth']
+    limiter.limit, limiter.max_queue = 1, 0
+    assert limiter.acquire()
+
+    assert client.post('/api/auth/login', json={'email': 'test@example.com', 'password': 'password123'}).status_code == 503
+    assert client.get('/api/auth/me', headers=headers).status_code == 200
+    limiter.release()
+    assert client.post('/api/auth/login', json={'email': 'test@example.com', 'password': 'password123'}).status_code == 200
@@ -146,3 +146,31 @@ def test_invalid_item_data(client, auth_token):
     
     assert response.status_code == 400
     assert 'errors' in response.get_json()
+
+
+def test_update_item_partial(client, auth_token):
+    """Test that updating one field leaves the others unchanged."""
+    headers = {'Authorization': f'Bearer {auth_token}'}
+    
+    create_response = client.post('/api/items', 
+                                 json={'name': 'Partial Item', 'description': 'Keep me', 'price': 12.5},
+                                 headers=headers)
+    item_id = create_response.get_json()['id']
+    
+    response = client.put(f'/api/items/{item_id}', json={'price': 13.5}, headers=headers)
+    
+    assert response.status_code == 200
+    assert response.get_json() == {
+        'id': item_id, 'name': 'Partial Item', 'description': 'Keep me', 'price': 13.5
+    }
+
+
+def test_update_and_delete_missing_item(client, auth_token):
+    """Test that updating or deleting a missing item returns 404."""
+    headers = {'Authorization': f'Bearer {auth_token}'}
+    
+    response = client.put('/api/items/999999', json={'name': 'Ghost'}, headers=headers)
+    assert response.status_code == 404
+    
+    response = client.delete('/api/items/999999', headers=headers)
+    assert response.status_code == 404
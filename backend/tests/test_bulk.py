@@ -0,0 +1,104 @@
+import json
+import sqlite3
+from app.utils import bulk
+
+
+def test_import_csv_reports_rejected_rows(client, auth_token):
+    """Test that a CSV import inserts valid rows and reports invalid ones."""
+    headers = {'Authorization': f'Bearer {auth_token}'}
+    body = (
+        "name,description,price\n"
+        "CSV Lamp,Desk lamp,19.99\n"
+        ",Missing name,5\n"
+        "CSV Mug,,not-a-price\n"
+        "CSV Pen,Blue ink,1.25\n"
+    )
+
+    response = client.post('/api/items/import', data=body, content_type='text/csv', headers=headers)
+
+    assert response.status_code == 200
+    report = response.get_json()
+    assert report['imported'] == 2
+    assert report['rejected_count'] == 2
+    assert [rejected['line'] for rejected in report['rejected']] == [3, 4]
+
+    names = [item['name'] for item in client.get('/api/items', headers=headers).get_json()]
+    assert 'CSV Lamp' in names and 'CSV Pen' in names
+
+
+def test_import_ndjson_in_chunks(app, client, auth_token):
+    """Test that an NDJSON import spanning several chunks inserts every valid row."""
+    headers = {'Authorization': f'Bearer {auth_token}'}
+    app.config['ITEM_IMPORT_CHUNK_SIZE'] = 3
+    lines = [json.dumps({'name': f'Bulk {i}', 'price': i + 1}) for i in range(10)]
+    lines.append('{not json')
+
+    response = client.post('/api/items/import?format=ndjson', data='\n'.join(lines), headers=headers)
+
+    report = response.get_json()
+    assert report['imported'] == 10
+    assert report['rejected'] == [{'line': 11, 'errors': ['Row could not be parsed']}]
+
+
+def test_export_round_trip(client, auth_token):
+    """Test that exports stream every item in the requested format."""
+    headers = {'Authorization': f'Bearer {auth_token}'}
+    items = client.get('/api/items', headers=headers).get_json()
+
+    response = client.get('/api/items/export?format=ndjson', headers=headers)
+    assert response.status_code == 200
+    exported = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [row['id'] for row in exported] == [item['id'] for item in items]
+
+    response = client.get('/api/items/export', headers=headers)
+    assert response.mimetype == 'text/csv'
+    assert response.get_data(as_text=True).splitlines()[0] == 'id,name,description,price'
+
+    response = client.get('/api/items/export?format=xml', headers=headers)
+    assert response.status_code == 400
+
+
+def test_import_rejects_non_finite_prices(client, auth_token):
+    """Test that inf and nan prices are rejected rows and the statistics stay valid JSON."""
+    headers = {'Authorization': f'Bearer {auth_token}'}
+    body = "name,price\nInfinite,inf\nNot A Number,nan\nFinite,2.5\n"
+
+    response = client.post('/api/items/import', data=body, content_type='text/csv', headers=headers)
+
+    report = response.get_json()
+    assert response.status_code == 200
+    assert report['imported'] == 1
+    assert [rejected['errors'] for rejected in report['rejected']] == [["Price must be a finite number"]] * 2
+    assert 'Infinity' not in client.get('/api/items/stats', headers=headers).get_data(as_text=True)
+
+
+def test_import_failure_reports_committed_rows(app, client, auth_token):
+    """Test that an import stopping part-way still reports the chunks it committed."""
+    headers = {'Authorization': f'Bearer {auth_token}'}
+    app.config['ITEM_IMPORT_CHUNK_SIZE'] = 100
+    # Well past the first block the decoder reads, then a byte that is not UTF-8
+    body = ''.join(json.dumps({'name': f'Partial {i}', 'price': 1}) + '\n' for i in range(600)).encode()
+    body += b'{"name": "Bad \xff", "price": 1}\n'
+
+    response = client.post('/api/items/import?format=ndjson', data=body, headers=headers)
+
+    assert response.status_code == 400
+    report = response.get_json()
+    assert report['aborted']['cause'] == 'input'
+    assert report['imported'] > 0 and report['imported'] % 100 == 0
+    names = [item['name'] for item in client.get('/api/items', headers=headers).get_json()]
+    assert sum(name.startswith('Partial ') for name in names) == report['imported']
+
+
+def test_import_database_error_keeps_committed_chunks():
+    """Test that a chunk refused by the database stops the import without losing earlier chunks."""
+    conn = sqlite3.connect(':memory:')
+    conn.execute("CREATE TABLE items (name TEXT, description TEXT, price REAL CHECK (price < 100))")
+    rows = [(n, {'name': f'Row {n}', 'price': 500 if n == 5 else 1}) for n in range(1, 8)]
+
+    report = bulk.import_items(conn, iter(rows), chunk_size=2)
+
+    assert report['imported'] == 4
+    assert report['aborted']['cause'] == 'database'
+    assert report['aborted']['after_line'] == 6
+    assert conn.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 4
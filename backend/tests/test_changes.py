@@ -0,0 +1,147 @@
+import sqlite3
+from contextlib import contextmanager
+from app import create_app
+from app.models import item as item_module
+from app.models.item import Item
+from app.utils.database import get_db_connection, init_db
+
+
+def test_item_changes_since(client, auth_token):
+    """Test that the change feed returns only rows changed or deleted after a sequence number."""
+    headers = {'Authorization': f'Bearer {auth_token}'}
+
+    seq = client.get('/api/items/changes', headers=headers).get_json()['seq']
+
+    first = client.post('/api/items', json={'name': 'First', 'price': 1.5}, headers=headers).get_json()
+    second = client.post('/api/items', json={'name': 'Second', 'price': 2.5}, headers=headers).get_json()
+    client.put(f"/api/items/{first['id']}", json={'name': 'First Renamed'}, headers=headers)
+    client.delete(f"/api/items/{second['id']}", headers=headers)
+
+    response = client.get(f'/api/items/changes?since={seq}', headers=headers)
+    assert response.status_code == 200
+    data = response.get_json()
+    assert [item['name'] for item in data['items']] == ['First Renamed']
+    assert data['deleted'] == [second['id']]
+    assert data['seq'] > seq
+    assert data['has_more'] is False
+
+    # Nothing new after the returned cursor
+    data = client.get(f"/api/items/changes?since={data['seq']}", headers=headers).get_json()
+    assert data['items'] == [] and data['deleted'] == []
+
+
+def test_item_changes_paginates(client, auth_token):
+    """Test that the change feed pages by sequence number."""
+    headers = {'Authorization': f'Bearer {auth_token}'}
+
+    data = client.get('/api/items/changes?since=0&limit=2', headers=headers).get_json()
+    assert len(data['items']) == 2
+    assert data['has_more'] is True
+
+    rest = client.get(f"/api/items/changes?since={data['seq']}&limit=1000", headers=headers).get_json()
+    assert {item['id'] for item in data['items']}.isdisjoint(item['id'] for item in rest['items'])
+
+
+def test_item_stream_sends_current_seq(app, client, auth_token):
+    """Test that the event stream announces the latest sequence number."""
+    headers = {'Authorization': f'Bearer {auth_token}'}
+    app.config['ITEM_STREAM_POLL_INTERVAL'] = 0.01
+    app.config['ITEM_STREAM_MAX_DURATION'] = 0
+
+    seq = client.get('/api/items/changes', headers=headers).get_json()['seq']
+    client.post('/api/items', json={'name': 'Streamed', 'price': 3.0}, headers=headers)
+
+    response = client.get(f'/api/items/stream?since={seq}', headers=headers)
+    assert response.status_code == 200
+    assert response.mimetype == 'text/event-stream'
+    assert f"id: {seq + 1}\n" in response.get_data(as_text=True)
+
+
+def test_item_stream_accepts_stream_token_in_query(app, client, auth_token):
+    """Test that the stream accepts a stream token in the query string, and nothing else does."""
+    headers = {'Authorization': f'Bearer {auth_token}'}
+    app.config['ITEM_STREAM_MAX_DURATION'] = 0
+
+    data = client.post('/api/items/stream/token', headers=headers).get_json()
+    assert data['expires_in'] == 60
+
+    response = client.get(f"/api/items/stream?token={data['token']}")
+    assert response.status_code == 200
+    assert response.mimetype == 'text/event-stream'
+    response.close()
+
+    # Full access tokens stay out of URLs, and stream tokens open nothing else
+    assert client.get(f'/api/items/stream?token={auth_token}').status_code == 401
+    assert client.get('/api/items', headers={'Authorization': f"Bearer {data['token']}"}).status_code == 403
+
+
+def test_item_streams_are_capped(app, client, auth_token):
+    """Test that open streams have their own admission limit and release it when they end."""
+    headers = {'Authorization': f'Bearer {auth_token}'}
+    app.config['ITEM_STREAM_MAX_DURATION'] = 0
+    limiter = app.extensions['admission_control'].limiters['items_stream']
+
+    response = client.get('/api/items/stream', headers=headers, buffered=False)
+    assert limiter.stats()['active'] == 1
+    response.get_data()
+    response.close()
+    assert limiter.stats()['active'] == 0
+
+    limiter.limit = 0
+    response = client.get('/api/items/stream', headers=headers)
+    assert response.status_code == 503
+    assert client.get('/api/items', headers=headers).status_code == 200
+
+
+def test_item_changes_reads_one_snapshot(tmp_path, monkeypatch):
+    """Test that writes committed between the two change-log reads are not skipped."""
+    app = create_app('testing')
+    app.config['DATABASE_PATH'] = str(tmp_path / 'items.db')
+    try:
+        with app.app_context():
+            init_db()
+            seq = Item.get_changes(0, 1000)['seq']
+
+            class InjectingCursor:
+                """Commits an update and a delete from another connection just before the tombstone read"""
+                def __init__(self, cursor):
+                    self.cursor = cursor
+
+                def execute(self, sql, *args):
+                    if 'item_tombstones' in sql:
+                        writer = sqlite3.connect(app.config['DATABASE_PATH'])
+                        writer.execute("UPDATE items SET name = 'Renamed' WHERE id = 1")
+                        writer.execute("DELETE FROM items WHERE id = 2")
+                        writer.commit()
+                        writer.close()
+                    return self.cursor.execute(sql, *args)
+
+                def __getattr__(self, name):
+                    return getattr(self.cursor, name)
+
+            class InjectingConnection:
+                def __init__(self, conn):
+                    self.conn = conn
+
+                def cursor(self):
+                    return InjectingCursor(self.conn.cursor())
+
+                def __getattr__(self, name):
+                    return getattr(self.conn, name)
+
+            @contextmanager
+            def injecting_connection():
+                with get_db_connection() as conn:
+                    yield InjectingConnection(conn)
+
+            monkeypatch.setattr(item_module, 'get_db_connection', injecting_connection)
+            first = Item.get_changes(seq, 1000)
+            monkeypatch.undo()
+
+            # Neither write is in the first snapshot, so the cursor does not pass them
+            assert first['items'] == [] and first['deleted'] == [] and first['seq'] == seq
+            second = Item.get_changes(first['seq'], 1000)
+            assert [item['name'] for item in second['items']] == ['Renamed']
+            assert second['deleted'] == [2]
+    finally:
+        app.extensions['job_manager'].shutdown()
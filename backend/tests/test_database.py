@@ -0,0 +1,66 @@
+import threading
+import time
+from app import create_app
+from app.utils.database import close_memory_database, get_db_connection, init_db
+
+
+def test_memory_database_is_shared_within_app(app):
+    """Test that every connection of one app sees the same in-memory database."""
+    with app.app_context():
+        with get_db_connection() as conn:
+            conn.execute("INSERT INTO items (name, price) VALUES ('Shared', 1.0)")
+            conn.commit()
+        with get_db_connection() as conn:
+            row = conn.execute("SELECT name FROM items WHERE name = 'Shared'").fetchone()
+    assert row['name'] == 'Shared'
+
+
+def test_memory_databases_are_isolated_between_apps(app):
+    """Test that each app gets its own copy of the template database."""
+    with app.app_context():
+        with get_db_connection() as conn:
+            conn.execute("DELETE FROM items")
+            conn.commit()
+
+    other = create_app('testing')
+    try:
+        with other.app_context():
+            init_db()
+            with get_db_connection() as conn:
+                assert conn.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 5
+                assert conn.execute("SELECT COUNT(*) FROM users").fetchone()[0] == 1
+    finally:
+        other.extensions['job_manager'].shutdown()
+        close_memory_database(other)
+
+
+def test_memory_database_write_waits_for_open_read(app, auth_token):
+    """Test that writes made while another connection is mid-read wait for it instead of failing."""
+    headers = {'Authorization': f'Bearer {auth_token}'}
+    # Locking is under test here, not admission control
+    app.extensions['admission_control'].limiters['items_write'].limit = 8
+    reading = threading.Event()
+
+    def slow_reader():
+        with app.app_context(), get_db_connection() as conn:
+            cursor = conn.execute("SELECT id FROM items")
+            cursor.fetchone()
+            reading.set()
+            time.sleep(0.3)
+            cursor.fetchall()
+
+    reader = threading.Thread(target=slow_reader)
+    reader.start()
+    assert reading.wait(2)
+
+    responses = []
+    def write(n):
+        responses.append(app.test_client().put(f'/api/items/{n}', json={'name': f'Renamed {n}'}, headers=headers))
+
+    writers = [threading.Thread(target=write, args=(n,)) for n in range(1, 5)]
+    for writer in writers:
+        writer.start()
+    for thread in writers + [reader]:
+        thread.join(5)
+
+    assert [response.status_code for response in responses] == [200] * 4
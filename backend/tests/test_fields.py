@@ -0,0 +1,47 @@
+from app.utils.database import get_db_connection
+
+
+def test_items_sparse_fieldset(client, auth_token):
+    """Test that ?fields= narrows list and detail responses and always keeps id."""
+    headers = {'Authorization': f'Bearer {auth_token}'}
+
+    response = client.get('/api/items?fields=name,price', headers=headers)
+    assert response.status_code == 200
+    items = response.get_json()
+    assert items and all(set(item) == {'id', 'name', 'price'} for item in items)
+
+    response = client.get(f"/api/items/{items[0]['id']}?fields=name", headers=headers)
+    assert response.get_json() == {'id': items[0]['id'], 'name': items[0]['name']}
+
+    response = client.get('/api/items/999999?fields=name', headers=headers)
+    assert response.status_code == 404
+
+
+def test_items_default_shape_matches_detail(client, auth_token):
+    """Test that list and detail responses without ?fields= return the same keys, without tracking columns."""
+    headers = {'Authorization': f'Bearer {auth_token}'}
+
+    items = client.get('/api/items', headers=headers).get_json()
+    detail = client.get(f"/api/items/{items[0]['id']}", headers=headers).get_json()
+    assert set(items[0]) == set(detail) == {'id', 'name', 'description', 'price'}
+    assert items[0] == detail
+
+    response = client.get('/api/items?fields=seq,updated_at', headers=headers)
+    assert set(response.get_json()[0]) == {'id', 'seq', 'updated_at'}
+
+
+def test_items_fields_rejects_unknown(client, auth_token):
+    """Test that fields outside the whitelist are rejected."""
+    headers = {'Authorization': f'Bearer {auth_token}'}
+
+    response = client.get('/api/items?fields=name,password_hash', headers=headers)
+    assert response.status_code == 400
+    assert 'password_hash' in response.get_json()['errors'][0]
+
+
+def test_narrow_listing_uses_covering_index(app):
+    """Test that a narrow listing is answered from the covering index."""
+    with app.app_context():
+        with get_db_connection() as conn:
+            plan = conn.execute("EXPLAIN QUERY PLAN SELECT id, name, price FROM items ORDER BY id").fetchall()
+    assert 'COVERING INDEX idx_items_listing' in plan[0]['detail']
@@ -0,0 +1,121 @@
+import threading
+import time
+from app.utils.database import get_db_connection
+
+
+def wait_for_job(client, headers, job_id, timeout=5):
+    """Poll a job until it reaches a finished status."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = client.get(f'/api/jobs/{job_id}', headers=headers).get_json()
+        if job['status'] in ('succeeded', 'failed', 'cancelled'):
+            return job
+        time.sleep(0.02)
+    raise AssertionError(f"job {job_id} did not finish: {job}")
+
+
+def test_submit_and_poll_job(client, auth_token):
+    """Test that a submitted job runs in the background and reports its result."""
+    headers = {'Authorization': f'Bearer {auth_token}'}
+
+    response = client.post('/api/jobs', json={'type': 'recompute_stats'}, headers=headers)
+    assert response.status_code == 202
+    job_id = response.get_json()['id']
+    assert response.headers['Location'] == f'/api/jobs/{job_id}'
+
+    job = wait_for_job(client, headers, job_id)
+    assert job['status'] == 'succeeded'
+    assert job['progress'] == 1
+    assert job['result'] == {'errors': []}
+
+
+def test_submit_job_validation(app, client, auth_token):
+    """Test that unknown job types and missing jobs are reported."""
+    headers = {'Authorization': f'Bearer {auth_token}'}
+    app.config['JOB_OPERATOR_EMAILS'] = ['test@example.com']
+
+    response = client.post('/api/jobs', json={'type': 'drop_everything'}, headers=headers)
+    assert response.status_code == 400
+
+    response = client.get('/api/jobs/does-not-exist', headers=headers)
+    assert response.status_code == 404
+
+    # Params are checked against the handler before the job is queued
+    response = client.post('/api/jobs', json={'type': 'reindex', 'params': {'table': 'items'}}, headers=headers)
+    assert response.status_code == 400
+    assert "Unknown parameter 'table'" in response.get_json()['errors'][0]
+
+    response = client.post('/api/jobs', json={'type': 'vacuum', 'params': {'full': 'yes'}}, headers=headers)
+    assert response.status_code == 400
+    assert response.get_json()['errors'] == ["Parameter 'full' must be of type bool"]
+
+
+def test_cancel_running_job(app, client, auth_token):
+    """Test that a running job stops at its next progress report after a cancel."""
+    headers = {'Authorization': f'Bearer {auth_token}'}
+    started = threading.Event()
+
+    def slow_job(ctx):
+        started.set()
+        for step in range(500):
+            ctx.progress(step, 500)
+            time.sleep(0.01)
+        return {'finished': True}
+
+    app.extensions['job_manager'].handlers['slow'] = slow_job
+    app.config['JOB_USER_TYPES'] = ['slow']
+
+    job_id = client.post('/api/jobs', json={'type': 'slow'}, headers=headers).get_json()['id']
+    assert started.wait(2)
+
+    response = client.post(f'/api/jobs/{job_id}/cancel', headers=headers)
+    assert response.status_code == 202
+    assert response.get_json()['cancel_requested'] is True
+
+    job = wait_for_job(client, headers, job_id)
+    assert job['status'] == 'cancelled'
+    assert job['result'] is None
+
+
+def test_vacuum_is_incremental_by_default(app, client, auth_token):
+    """Test that the vacuum job releases free pages in batches without a full VACUUM."""
+    headers = {'Authorization': f'Bearer {auth_token}'}
+    app.config['JOB_OPERATOR_EMAILS'] = ['test@example.com']
+    with app.app_context():
+        with get_db_connection() as conn:
+            conn.executemany("INSERT INTO items (name, price) VALUES (?, 1.0)", [('x' * 500,)] * 1000)
+            conn.commit()
+            conn.execute("DELETE FROM items WHERE price = 1.0")
+            conn.commit()
+            assert conn.execute("PRAGMA freelist_count").fetchone()[0] > 0
+
+    job_id = client.post('/api/jobs', json={'type': 'vacuum'}, headers=headers).get_json()['id']
+    job = wait_for_job(client, headers, job_id)
+    assert job['status'] == 'succeeded'
+    assert job['result']['full'] is False
+    assert job['result']['pages_after'] < job['result']['pages_before']
+
+    with app.app_context():
+        with get_db_connection() as conn:
+            assert conn.execute("PRAGMA freelist_count").fetchone()[0] == 0
+
+
+def test_jobs_are_limited_to_their_owner_and_operators(app, client, auth_token):
+    """Test that heavy job types need an operator and only owners or operators see and cancel a job."""
+    headers = {'Authorization': f'Bearer {auth_token}'}
+    response = client.post('/api/jobs', json={'type': 'vacuum', 'params': {'full': True}}, headers=headers)
+    assert response.status_code == 403
+
+    job_id = client.post('/api/jobs', json={'type': 'recompute_stats'}, headers=headers).get_json()['id']
+
+    client.post('/api/auth/register', json={'email': 'other@example.com', 'password': 'password123', 'name': 'Other'})
+    other_token = client.post('/api/auth/login', json={
+        'email': 'other@example.com', 'password': 'password123'
+    }).get_json()['access_token']
+    other = {'Authorization': f'Bearer {other_token}'}
+    assert client.get(f'/api/jobs/{job_id}', headers=other).status_code == 404
+    assert client.post(f'/api/jobs/{job_id}/cancel', headers=other).status_code == 404
+
+    app.config['JOB_OPERATOR_EMAILS'] = ['other@example.com']
+    assert client.get(f'/api/jobs/{job_id}', headers=other).status_code == 200
+    assert client.post('/api/jobs', json={'type': 'reindex'}, headers=other).status_code == 202
@@ -0,0 +1,114 @@
+import os
+import sqlite3
+from app import create_app
+from app.utils.database import get_db_connection, init_db
+from app.utils.maintenance import MaintenanceScheduler, incremental_vacuum
+
+
+def _churn_items(count=2000):
+    """Insert and delete enough items to leave free pages behind"""
+    with get_db_connection() as conn:
+        conn.executemany(
+            "INSERT INTO items (name, description, price) VALUES (?, ?, ?)",
+            [(f"Churn {n}", 'x' * 400, 1.0) for n in range(count)]
+        )
+        conn.commit()
+        conn.execute("DELETE FROM items WHERE name LIKE 'Churn %'")
+        conn.commit()
+        return conn.execute("PRAGMA freelist_count").fetchone()[0]
+
+
+def test_maintenance_run(app):
+    """Test that a run refreshes planner statistics and releases free pages."""
+    maintenance = MaintenanceScheduler(app)
+
+    with app.app_context():
+        assert _churn_items() > 0
+        report = maintenance.run()
+
+        with get_db_connection() as conn:
+            assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+            assert conn.execute("PRAGMA freelist_count").fetchone()[0] == 0
+            assert conn.execute("SELECT COUNT(*) FROM sqlite_stat1").fetchone()[0] > 0
+
+    assert report['analyze'] == {'analyzed': True, 'timed_out': False}
+    assert report['incremental_vacuum']['pages_freed'] > 0
+    assert 'checkpoint' in report
+    assert maintenance.stats()['runs'] == 1
+
+    # Few changes since: only the cheap PRAGMA optimize
+    with app.app_context():
+        assert maintenance.run()['analyze']['analyzed'] is False
+
+
+def test_incremental_vacuum_is_time_boxed(app):
+    """Test that incremental vacuum stops at its time budget and leaves the rest for later."""
+    with app.app_context():
+        free_pages = _churn_items()
+        with get_db_connection() as conn:
+            report = incremental_vacuum(conn, 0, batch_pages=1)
+
+    assert report['timed_out'] is True
+    assert report['free_pages'] == free_pages
+
+
+def test_maintenance_waits_for_quiet_period(app, client):
+    """Test that due maintenance is deferred while requests keep arriving, up to the max delay."""
+    app.config.update(MAINTENANCE_INTERVAL=60, MAINTENANCE_MAX_DELAY=600, MAINTENANCE_IDLE_MAX_REQUESTS=0)
+    maintenance = MaintenanceScheduler(app)
+    started = maintenance._scheduled_since
+
+    client.get('/')
+    assert maintenance.tick(now=started + 30) is None
+    assert maintenance.deferred == 0
+
+    client.get('/')
+    assert maintenance.tick(now=started + 90) is None
+    assert maintenance.deferred == 1
+
+    # Quiet since the last check
+    assert maintenance.tick(now=started + 120) is not None
+    assert maintenance.runs == 1
+
+    client.get('/')
+    assert maintenance.tick(now=maintenance.last_run + 700) is not None
+    assert maintenance.runs == 2
+
+
+def test_wal_file_shrinks(tmp_path):
+    """Test that the WAL is cut back after checkpoints instead of keeping its largest size."""
+    app = create_app('testing')
+    app.config['DATABASE_PATH'] = str(tmp_path / 'items.db')
+    app.config['DATABASE_JOURNAL_SIZE_LIMIT'] = 64 * 1024
+    wal_path = app.config['DATABASE_PATH'] + '-wal'
+    maintenance = MaintenanceScheduler(app)
+    other_worker = None
+    try:
+        with app.app_context():
+            init_db()
+            # The last connection to close deletes the WAL; another worker keeps it
+            other_worker = sqlite3.connect(app.config['DATABASE_PATH'])
+            other_worker.execute("SELECT COUNT(*) FROM items").fetchone()
+            _churn_items()
+            assert os.path.getsize(wal_path) > 64 * 1024
+
+            # A passive checkpoint copies the WAL back but leaves the file large
+            assert maintenance.run()['checkpoint']['truncated'] is False
+            assert os.path.getsize(wal_path) > 64 * 1024
+
+            # In a quiet period the file is cut to nothing
+            assert maintenance.run(truncate_wal=True)['checkpoint']['truncated'] is True
+            assert os.path.getsize(wal_path) == 0
+
+            # Otherwise the first write after a complete checkpoint cuts it to the size limit
+            _churn_items()
+            assert os.path.getsize(wal_path) > 64 * 1024
+            with get_db_connection() as conn:
+                conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+                conn.execute("INSERT INTO items (name, price) VALUES ('After', 1)")
+                conn.commit()
+            assert os.path.getsize(wal_path) <= 64 * 1024
+    finally:
+        if other_worker is not None:
+            other_worker.close()
+        app.extensions['job_manager'].shutdown()
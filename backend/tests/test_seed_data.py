@@ -0,0 +1,86 @@
+import sqlite3
+import sys
+import seed_data
+from app.config import Config
+from app.utils.stats import validate_item_stats
+
+GENERATOR_DEFAULTS = dict(
+    users=0, seed=7, distribution='lognormal', price_min=0.99, price_max=5000.0,
+    description_words=12, password='password123', batch_size=100, append=False
+)
+
+
+def _schema_objects(conn):
+    return conn.execute(
+        "SELECT type, name FROM sqlite_master WHERE type IN ('index', 'trigger') ORDER BY name"
+    ).fetchall()
+
+
+def test_same_seed_generates_same_items(tmp_path):
+    """Test that the generator is deterministic for a given seed."""
+    datasets = []
+    for name in ('a.db', 'b.db', 'c.db'):
+        seed = 8 if name == 'c.db' else 7
+        seed_data.generate_dataset(str(tmp_path / name), items=300, **{**GENERATOR_DEFAULTS, 'seed': seed})
+        conn = sqlite3.connect(tmp_path / name)
+        datasets.append(conn.execute("SELECT name, description, price FROM items ORDER BY id").fetchall())
+        conn.close()
+
+    assert len(datasets[0]) == 300
+    assert datasets[0] == datasets[1]
+    assert datasets[0] != datasets[2]
+
+
+def test_failed_load_restores_indexes_triggers_and_stats(tmp_path, monkeypatch):
+    """Test that indexes, triggers and the statistics summary are rebuilt even when the load fails."""
+    database = str(tmp_path / 'items.db')
+    seed_data.generate_dataset(database, items=50, **GENERATOR_DEFAULTS)
+    conn = sqlite3.connect(database)
+    expected_objects = _schema_objects(conn)
+    conn.close()
+
+    generate_items = seed_data.generate_items
+
+    def failing_items(*args):
+        for n, row in enumerate(generate_items(*args)):
+            if n == 250:
+                raise RuntimeError("disk full")
+            yield row
+
+    monkeypatch.setattr(seed_data, 'generate_items', failing_items)
+    assert seed_data.generate_dataset(database, items=1000, **GENERATOR_DEFAULTS) is False
+
+    conn = sqlite3.connect(database)
+    assert conn.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 200
+    assert _schema_objects(conn) == expected_objects
+    assert validate_item_stats(conn, Config.ITEM_PRICE_BUCKETS) == []
+    conn.close()
+
+
+def test_generating_users_only_keeps_items(tmp_path, monkeypatch):
+    """Test that --users without --items adds users and leaves the items alone."""
+    database = str(tmp_path / 'items.db')
+    seed_data.generate_dataset(database, items=20, **GENERATOR_DEFAULTS)
+
+    monkeypatch.setattr(sys, 'argv', ['seed_data.py', '--database', database, '--users', '3'])
+    assert seed_data.main() == 0
+
+    conn = sqlite3.connect(database)
+    assert conn.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 20
+    assert conn.execute("SELECT COUNT(*) FROM users").fetchone()[0] == 3
+    conn.close()
+
+
+def test_generated_user_count_skips_existing_emails(tmp_path, capsys):
+    """Test that users whose email is already taken are not reported as created."""
+    database = str(tmp_path / 'items.db')
+    seed_data.generate_dataset(database, items=0, **GENERATOR_DEFAULTS)
+    conn = sqlite3.connect(database)
+    conn.execute("INSERT INTO users (email, password_hash, name) VALUES ('user2@example.com', 'x', 'Taken')")
+    conn.commit()
+    conn.close()
+
+    assert seed_data.generate_dataset(database, items=0, **{**GENERATOR_DEFAULTS, 'users': 3}) is True
+    output = capsys.readouterr().out
+    assert "Created 2 users" in output
+    assert "Skipped 1 users" in output
@@ -0,0 +1,126 @@
+import threading
+import time
+from app.models.item import Item
+from app.utils.singleflight import SingleFlight
+
+
+def test_concurrent_calls_share_one_execution():
+    """Test that callers arriving during an execution get its result instead of running again."""
+    single_flight = SingleFlight()
+    release = threading.Event()
+    executions = []
+
+    def slow_read():
+        executions.append(1)
+        release.wait(2)
+        return object()
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(single_flight.do('key', slow_read)))
+               for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    while single_flight.stats()['calls'] < 5:
+        time.sleep(0.001)
+    release.set()
+    for thread in threads:
+        thread.join(2)
+
+    assert len(executions) == 1
+    assert len(results) == 5 and all(result is results[0] for result in results)
+    assert single_flight.stats()['keys']["'key'"] == {'calls': 5, 'executions': 1, 'coalesced': 4}
+
+    # Finished calls are not cached
+    single_flight.do('key', slow_read)
+    assert len(executions) == 2
+
+
+def test_errors_reach_every_waiter():
+    """Test that an exception in the shared execution is raised for every caller."""
+    single_flight = SingleFlight()
+
+    def broken():
+        raise ValueError("boom")
+
+    try:
+        single_flight.do('key', broken)
+    except ValueError as e:
+        assert str(e) == "boom"
+    else:
+        raise AssertionError("expected ValueError")
+    assert single_flight.stats()['in_flight'] == 0
+
+
+def test_concurrent_item_requests_are_coalesced(app, auth_token, monkeypatch):
+    """Test that concurrent identical item listings run one query."""
+    headers = {'Authorization': f'Bearer {auth_token}'}
+    get_all = Item.get_all
+    queries = []
+
+    def slow_get_all(fields=None):
+        queries.append(fields)
+        time.sleep(0.2)
+        return get_all(fields)
+
+    monkeypatch.setattr(Item, 'get_all', staticmethod(slow_get_all))
+
+    responses = []
+    def fetch():
+        responses.append(app.test_client().get('/api/items?fields=name', headers=headers))
+
+    threads = [threading.Thread(target=fetch) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    assert [response.status_code for response in responses] == [200] * 4
+    assert len({response.get_data() for response in responses}) == 1
+    assert len(queries) < 4
+
+
+def test_forgotten_call_is_not_joined():
+    """Test that callers arriving after forget() start a new call while the old one finishes."""
+    single_flight = SingleFlight()
+    release = threading.Event()
+    old = threading.Thread(target=lambda: single_flight.do('key', lambda: release.wait(2) and 'old'))
+    old.start()
+    while single_flight.stats()['in_flight'] < 1:
+        time.sleep(0.001)
+
+    single_flight.forget(lambda key: key == 'key')
+    assert single_flight.do('key', lambda: 'new') == 'new'
+
+    release.set()
+    old.join(2)
+    assert single_flight.stats()['in_flight'] == 0
+
+
+def test_read_after_write_sees_the_write(app, auth_token, monkeypatch):
+    """Test that a GET sent after a PUT does not join a read that started before the PUT."""
+    headers = {'Authorization': f'Bearer {auth_token}'}
+    find_by_id = Item.find_by_id
+    release = threading.Event()
+    started = threading.Event()
+
+    def slow_find_by_id(item_id):
+        item = find_by_id(item_id)
+        if not started.is_set():
+            started.set()
+            release.wait(2)
+        return item
+
+    monkeypatch.setattr(Item, 'find_by_id', staticmethod(slow_find_by_id))
+
+    stale = []
+    reader = threading.Thread(target=lambda: stale.append(app.test_client().get('/api/items/1', headers=headers)))
+    reader.start()
+    assert started.wait(2)
+
+    client = app.test_client()
+    assert client.put('/api/items/1', json={'name': 'Renamed'}, headers=headers).get_json()['name'] == 'Renamed'
+    assert client.get('/api/items/1', headers=headers).get_json()['name'] == 'Renamed'
+
+    release.set()
+    reader.join(2)
+    assert stale[0].get_json()['name'] == 'Sample Laptop'
@@ -0,0 +1,79 @@
+import sys
+import threading
+from app import create_app
+from app.config import config
+from app.models.item import Item
+from app.utils.startup import StartupProfile, Warmup
+
+
+def test_ready_reports_startup_profile(client):
+    """Test that /ready reports readiness and the startup phase timings."""
+    response = client.get('/ready')
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['ready'] is True
+    assert {'import:flask', 'import:flask_jwt_extended', 'create_app'} <= set(data['startup']['phases_ms'])
+
+
+def test_profile_times_first_import_of_each_module(monkeypatch):
+    """Test that each module's import is timed when it is loaded, and not for later imports."""
+    monkeypatch.delitem(sys.modules, 'colorsys', raising=False)
+    profile = StartupProfile()
+
+    module = profile.import_module('colorsys')
+    assert module is sys.modules['colorsys']
+    assert 'import:colorsys' in profile.report()['phases_ms']
+
+    second = StartupProfile()
+    assert second.import_module('colorsys') is module
+    assert second.report()['phases_ms'] == {}
+
+
+def test_warmup_gates_readiness(app):
+    """Test that readiness waits for every warmup task, including failing ones."""
+    warmup = Warmup(app, StartupProfile())
+    gate = threading.Event()
+    warmup.register('slow', gate.wait)
+    warmup.register('broken', lambda: 1 / 0)
+    warmup.start()
+
+    assert not warmup.is_ready()
+    assert warmup.status()['pending'] == ['slow', 'broken']
+
+    gate.set()
+    assert warmup.wait(2)
+    status = warmup.status()
+    assert status['completed'] == ['slow']
+    assert 'broken' in status['failed']
+
+
+def test_prime_page_cache_reads_first_items(app):
+    """Test that the page cache warmup task reads the first rows of the listing."""
+    with app.app_context():
+        assert Item.prime_page_cache(3) == 3
+
+
+def test_warmup_builds_suggest_index(tmp_path, monkeypatch):
+    """Test that a booting app builds the suggest index before it reports ready."""
+    monkeypatch.setitem(config, 'isolated', type('IsolatedConfig', (config['development'],), {
+        'DATABASE_PATH': str(tmp_path / 'items.db'),
+        'WARMUP_IN_BACKGROUND': False,
+        'WARMUP_PAGE_CACHE_ITEMS': 0,
+        'MAINTENANCE_ENABLED': False,
+    }))
+    app = create_app('isolated')
+    try:
+        assert app.extensions['warmup'].status()['completed'] == ['recover_jobs', 'suggest_index']
+        assert app.extensions['suggest_index'].stats()['builds'] == 1
+    finally:
+        app.extensions['job_manager'].shutdown()
+
+
+def test_metrics_requires_authentication(app, client, auth_token):
+    """Test that /metrics needs a user token or the configured scraper token."""
+    assert client.get('/metrics').status_code == 401
+    assert client.get('/metrics', headers={'Authorization': f'Bearer {auth_token}'}).status_code == 200
+
+    app.config['METRICS_TOKEN'] = 'scrape-secret'
+    assert client.get('/metrics', headers={'Authorization': 'Bearer scrape-secret'}).status_code == 200
+    assert client.get('/metrics', headers={'Authorization': 'Bearer wrong'}).status_code == 422
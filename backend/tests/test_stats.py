@@ -0,0 +1,50 @@
+from app.utils.database import get_db_connection
+from app.utils.stats import recompute_item_stats, validate_item_stats
+
+
+def test_item_stats_requires_auth(client):
+    """Test that item statistics require authentication."""
+    response = client.get('/api/items/stats')
+    assert response.status_code == 401
+
+
+def test_item_stats_follow_writes(app, client, auth_token):
+    """Test that statistics are kept current by creates, updates and deletes."""
+    headers = {'Authorization': f'Bearer {auth_token}'}
+
+    before = client.get('/api/items/stats', headers=headers).get_json()
+
+    create_response = client.post('/api/items',
+                                  json={'name': 'Stats Item', 'price': 5000.0},
+                                  headers=headers)
+    item_id = create_response.get_json()['id']
+
+    data = client.get('/api/items/stats', headers=headers).get_json()
+    assert data['count'] == before['count'] + 1
+    assert data['price']['max'] == 5000.0
+    assert data['histogram'][-1]['count'] == before['histogram'][-1]['count'] + 1
+
+    client.put(f'/api/items/{item_id}', json={'price': 1.0}, headers=headers)
+    data = client.get('/api/items/stats', headers=headers).get_json()
+    assert data['price']['min'] == 1.0
+    assert data['price']['max'] == before['price']['max']
+
+    client.delete(f'/api/items/{item_id}', headers=headers)
+    data = client.get('/api/items/stats', headers=headers).get_json()
+    assert data == before
+
+    with app.app_context():
+        with get_db_connection() as conn:
+            assert validate_item_stats(conn, app.config['ITEM_PRICE_BUCKETS']) == []
+
+
+def test_item_stats_recompute_fixes_drift(app):
+    """Test that a full recompute repairs a summary that has drifted."""
+    with app.app_context():
+        with get_db_connection() as conn:
+            conn.execute("UPDATE item_stats SET item_count = item_count + 7")
+            conn.commit()
+            assert validate_item_stats(conn, app.config['ITEM_PRICE_BUCKETS'])
+
+            recompute_item_stats(conn, app.config['ITEM_PRICE_BUCKETS'])
+            assert validate_item_stats(conn, app.config['ITEM_PRICE_BUCKETS']) == []
@@ -0,0 +1,125 @@
+import threading
+import time
+from app.utils.database import get_db_connection
+from app.utils.prefix_index import PrefixIndex
+
+
+def test_prefix_index_matches_word_starts():
+    """Test that names match on their start or any word start, case-insensitively, capped at limit."""
+    rows = [(1, 'Wireless Headphones'), (2, 'Wired Mouse'), (3, 'Noise Cancelling Headphones')]
+    index = PrefixIndex(lambda: (3, rows), lambda: 3)
+
+    assert index.search('WIRE') == [(2, 'Wired Mouse'), (1, 'Wireless Headphones')]
+    assert [item_id for item_id, _ in index.search('head')] == [1, 3]
+    assert len(index.search('head', limit=1)) == 1
+    assert index.search('') == []
+
+
+def test_suggest_follows_local_writes_incrementally(app, client, auth_token):
+    """Test that writes through the API update the index without a rebuild."""
+    headers = {'Authorization': f'Bearer {auth_token}'}
+
+    assert client.get('/api/items/suggest?prefix=zeb', headers=headers).get_json() == []
+    item_id = client.post('/api/items', json={'name': 'Zebra Lamp', 'price': 10}, headers=headers).get_json()['id']
+
+    response = client.get('/api/items/suggest?prefix=zeb', headers=headers)
+    assert response.get_json() == [{'id': item_id, 'name': 'Zebra Lamp'}]
+    assert client.get('/api/items/suggest?prefix=lamp', headers=headers).get_json()[0]['id'] == item_id
+
+    client.put(f'/api/items/{item_id}', json={'name': 'Yak Lamp'}, headers=headers)
+    assert client.get('/api/items/suggest?prefix=zeb', headers=headers).get_json() == []
+    client.delete(f'/api/items/{item_id}', headers=headers)
+    assert client.get('/api/items/suggest?prefix=yak', headers=headers).get_json() == []
+
+    stats = app.extensions['suggest_index'].stats()
+    assert stats['builds'] == 1
+    assert stats['incremental_updates'] == 3
+
+
+def test_suggest_catches_up_after_external_writes(app, client, auth_token):
+    """Test that changes made outside this process are applied from the change log without a rebuild."""
+    headers = {'Authorization': f'Bearer {auth_token}'}
+    app.extensions['suggest_index'].check_interval = 0
+    item_id = client.post('/api/items', json={'name': 'Wombat Mug', 'price': 3}, headers=headers).get_json()['id']
+    client.get('/api/items/suggest?prefix=a', headers=headers)
+
+    with app.app_context():
+        with get_db_connection() as conn:
+            conn.execute("INSERT INTO items (name, price) VALUES ('Quokka Plush', 5)")
+            conn.execute("DELETE FROM items WHERE id = ?", (item_id,))
+            conn.commit()
+
+    data = client.get('/api/items/suggest?prefix=quo', headers=headers).get_json()
+    assert [item['name'] for item in data] == ['Quokka Plush']
+    assert client.get('/api/items/suggest?prefix=wom', headers=headers).get_json() == []
+    stats = app.extensions['suggest_index'].stats()
+    assert stats['builds'] == 1
+    assert stats['catch_ups'] == 1
+
+
+def test_out_of_order_local_writes_are_caught_up():
+    """Test that a local write arriving ahead of an earlier one is caught up from the change log, not rebuilt."""
+    requested = []
+
+    def changes_loader(since):
+        requested.append(since)
+        return 3, [(2, 'Banana'), (3, 'Cherry')], []
+
+    index = PrefixIndex(lambda: (1, [(1, 'Apple')]), lambda: 3, check_interval=60, changes_loader=changes_loader)
+    index.build()
+
+    index.apply_upsert(3, 'Cherry', 3)
+    index.apply_upsert(2, 'Banana', 2)
+    assert index.search('ch') == [(3, 'Cherry')]
+    assert requested == [2]
+    stats = index.stats()
+    assert (stats['seq'], stats['builds'], stats['catch_ups']) == (3, 1, 1)
+
+
+def test_catch_up_falls_back_to_rebuild():
+    """Test that too many changes to apply one by one trigger a background rebuild instead."""
+    snapshots = [(1, [(1, 'Apple')]), (9, [(1, 'Apple'), (2, 'Apricot')])]
+    loads = []
+
+    def loader():
+        loads.append(1)
+        return snapshots[len(loads) - 1]
+
+    index = PrefixIndex(loader, lambda: 9, check_interval=0, changes_loader=lambda since: None)
+    index.build()
+    index.search('ap')
+
+    deadline = time.monotonic() + 2
+    while index.stats()['builds'] < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert index.search('ap') == [(1, 'Apple'), (2, 'Apricot')]
+    assert index.stats()['catch_ups'] == 0
+
+
+def test_rebuild_does_not_block_searches():
+    """Test that a slow rebuild runs once in the background while searches use the current arrays."""
+    release = threading.Event()
+    loads = []
+    snapshots = [(1, [(1, 'Apple')]), (2, [(1, 'Apple'), (2, 'Apricot')])]
+
+    def loader():
+        loads.append(1)
+        if len(loads) > 1:
+            release.wait(2)
+        return snapshots[min(len(loads), 2) - 1]
+
+    index = PrefixIndex(loader, lambda: 2, check_interval=0)
+    index.build()
+
+    started = time.monotonic()
+    for _ in range(5):
+        assert index.search('ap') == [(1, 'Apple')]
+    assert time.monotonic() - started < 0.5
+    assert index.stats()['rebuilding'] is True
+
+    release.set()
+    deadline = time.monotonic() + 2
+    while index.stats()['rebuilding'] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert index.search('ap') == [(1, 'Apple'), (2, 'Apricot')]
+    assert len(loads) == 2
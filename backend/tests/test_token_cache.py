@@ -0,0 +1,46 @@
+import time
+from app import create_app
+from app.auth.token_cache import TokenCache
+from app.config import TestingConfig
+from app.utils.database import init_db
+
+
+def test_token_cache_expiry_and_eviction():
+    """Test that cached claims expire with the token and the cache stays bounded."""
+    cache = TokenCache(max_size=2)
+
+    cache.put('a', {'sub': '1', 'exp': time.time() + 60})
+    cache.put('expired', {'sub': '2', 'exp': time.time() - 1})
+    assert cache.get('a')['sub'] == '1'
+    assert cache.get('expired') is None
+
+    cache.put('b', {'sub': '3', 'exp': time.time() + 60})
+    cache.put('c', {'sub': '4', 'exp': time.time() + 60})
+    assert cache.get('a') is None
+    assert cache.stats()['size'] == 2
+    assert cache.stats()['hits'] == 1
+
+
+def test_cached_tokens_still_respect_logout(monkeypatch, tmp_path):
+    """Test that cached tokens are reused but rejected as soon as they are revoked."""
+    monkeypatch.setattr(TestingConfig, 'JWT_CACHE_ENABLED', True)
+    app = create_app('testing')
+    app.config['DATABASE_PATH'] = str(tmp_path / 'test.db')
+    try:
+        with app.app_context():
+            init_db()
+        client = app.test_client()
+
+        token = client.post('/api/auth/login', json={
+            'email': 'demo@example.com', 'password': 'demo123'
+        }).get_json()['access_token']
+        headers = {'Authorization': f'Bearer {token}'}
+
+        for _ in range(3):
+            assert client.get('/api/items', headers=headers).status_code == 200
+        assert client.get('/metrics', headers=headers).get_json()['jwt_cache']['hits'] >= 2
+
+        assert client.delete('/api/auth/logout', headers=headers).status_code == 200
+        assert client.get('/api/items', headers=headers).status_code == 401
+    finally:
+        app.extensions['job_manager'].shutdown()